@@ -4,10 +4,105 @@ Production-ready client with error handling, retry logic, and webhooks
 """
 
 import os
+import json
+import atexit
+import asyncio
+import hashlib
+import mimetypes
+import random
+import threading
 import time
 import requests
-from typing import Optional, Dict, Any, Callable
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Optional, Dict, Any, Callable, Tuple
 from pathlib import Path
+from functools import lru_cache
+
+try:
+    from requests_toolbelt.multipart.encoder import MultipartEncoder
+except ImportError:
+    MultipartEncoder = None
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+# Status codes worth retrying (rate limiting and transient server errors)
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Job statuses after which polling stops
+TERMINAL_STATUSES = {"completed", "succeeded", "failed"}
+
+# Seconds a non-terminal job status is reused before polling again
+STATUS_CACHE_TTL = 0.2
+
+# Bytes read from disk per chunk when streaming an upload
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+@lru_cache(maxsize=64)
+def _guess_mime(ext: str) -> str:
+    """MIME type for a lowercase file extension (defaults to image/jpeg)"""
+    return mimetypes.types_map.get(ext) or "image/jpeg"
+
+
+def _url_idempotency_key(image_url: str) -> str:
+    """
+    Idempotency key for a URL ingest
+
+    Uses a BLAKE2b digest rather than hash(), which is randomized per
+    process, so every worker derives the same key for the same URL.
+    """
+    digest = hashlib.blake2b(image_url.encode(), digest_size=8).hexdigest()
+    return f"url-{digest}-{int(time.time())}"
+
+
+class _StreamingMultipart:
+    """
+    Multipart upload body streamed from an open file
+
+    Wraps requests_toolbelt's MultipartEncoder so the file is read in small
+    chunks while sending. seek(0) rewinds the file and rebuilds the encoder,
+    which lets urllib3 replay the body when it retries the request.
+    """
+
+    def __init__(self, fields_factory: Callable[[], Dict[str, Any]], fileobj):
+        self._fields_factory = fields_factory
+        self._fileobj = fileobj
+        self._start = fileobj.tell()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._encoder = MultipartEncoder(fields=self._fields_factory())
+        self._position = 0
+
+    @property
+    def content_type(self) -> str:
+        return self._encoder.content_type
+
+    def __len__(self) -> int:
+        return self._encoder.len
+
+    def read(self, size: int = -1) -> bytes:
+        # The HTTP layer asks for 8-16 KiB blocks; send larger chunks instead
+        if 0 <= size < UPLOAD_CHUNK_SIZE:
+            size = UPLOAD_CHUNK_SIZE
+        chunk = self._encoder.read(size)
+        self._position += len(chunk)
+        return chunk
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        if offset != 0 or whence != 0:
+            raise OSError("Streaming upload can only be rewound to the start")
+        self._fileobj.seek(self._start)
+        self._reset()
+        return 0
 
 
 class ImgGoClient:
@@ -15,8 +110,8 @@ class ImgGoClient:
     Production-ready ImgGo API client
 
     Usage:
-        client = ImgGoClient(api_key="your_key")
-        result = client.process_image("path/to/image.jpg", pattern_id="pat_xxx")
+        with ImgGoClient(api_key="your_key") as client:
+            result = client.process_image("path/to/image.jpg", pattern_id="pat_xxx")
     """
 
     def __init__(
@@ -43,6 +138,37 @@ class ImgGoClient:
         self.timeout = timeout
         self.max_retries = max_retries
 
+        # Retry 429/5xx inside the connection pool, honoring Retry-After
+        retry = Retry(
+            total=self.max_retries,
+            backoff_factor=0.5,
+            status_forcelist=sorted(RETRYABLE_STATUS_CODES),
+            allowed_methods={"GET", "POST"},
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+
+        # Persistent session: reuses TCP/TLS connections across uploads and polls
+        self._session = requests.Session()
+        self._session.headers["Authorization"] = f"Bearer {self.api_key}"
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=32, max_retries=retry)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+        # Short-lived job status cache to collapse duplicate polls
+        self._status_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._status_lock = threading.Lock()
+
+    def close(self) -> None:
+        """Close the underlying HTTP session and its pooled connections"""
+        self._session.close()
+
+    def __enter__(self) -> "ImgGoClient":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
     def process_image(
         self,
         image_path: str,
@@ -59,37 +185,59 @@ class ImgGoClient:
             pattern_id: ImgGo pattern ID
             idempotency_key: Optional idempotency key for retry safety
             poll: Whether to poll for results (True) or return job_id immediately (False)
-            webhook_url: Optional webhook URL for async notification
+            webhook_url: Optional webhook URL for async notification (disables polling)
 
         Returns:
-            Processed result data (if poll=True) or job info (if poll=False)
+            Processed result data (if poll=True) or job info (if poll=False or webhook_url set)
         """
+        p = Path(image_path)
+
         # Generate idempotency key if not provided
         if not idempotency_key:
-            idempotency_key = f"{Path(image_path).stem}-{int(time.time())}"
+            idempotency_key = f"{p.stem}-{int(time.time())}"
 
         # Upload image
-        import mimetypes
-        filename = Path(image_path).name
-        mime_type, _ = mimetypes.guess_type(image_path)
+        filename = p.name
+        mime_type = _guess_mime(p.suffix.lower())
 
-        with open(image_path, 'rb') as f:
-            files = {'image': (filename, f, mime_type or 'image/jpeg')}
-            data = {}
+        data = {}
 
-            if webhook_url:
-                data['webhook_url'] = webhook_url
+        if webhook_url:
+            data['webhook_url'] = webhook_url
 
-            response = self._make_request(
-                'POST',
-                f"/patterns/{pattern_id}/ingest",
-                files=files,
-                data=data if data else None,
-                headers={"Idempotency-Key": idempotency_key}
-            )
+        headers = {"Idempotency-Key": idempotency_key}
+
+        with open(image_path, 'rb') as f:
+            if MultipartEncoder is not None:
+                # Stream the multipart body from disk instead of buffering the file
+                body = _StreamingMultipart(
+                    lambda: {'image': (filename, f, mime_type), **data}, f
+                )
+                headers['Content-Type'] = body.content_type
+
+                response = self._make_request(
+                    'POST',
+                    f"/patterns/{pattern_id}/ingest",
+                    data=body,
+                    headers=headers
+                )
+            else:
+                files = {'image': (filename, f, mime_type)}
+
+                response = self._make_request(
+                    'POST',
+                    f"/patterns/{pattern_id}/ingest",
+                    files=files,
+                    data=data if data else None,
+                    headers=headers
+                )
 
         job_id = response["data"]["job_id"]
 
+        # The webhook delivers the result, so there is nothing to poll for
+        if webhook_url:
+            return {"job_id": job_id, "webhook_url": webhook_url}
+
         # Return immediately if not polling
         if not poll:
             return response["data"]
@@ -97,6 +245,35 @@ class ImgGoClient:
         # Poll for results
         return self.wait_for_job(job_id)
 
+    def process_image_bytes(
+        self,
+        image_path: str,
+        pattern_id: str,
+        idempotency_key: Optional[str] = None
+    ) -> bytes:
+        """
+        Process an image file and return the result as UTF-8 bytes
+
+        Text results (XML, YAML, CSV, plain text) are encoded once here so
+        callers can write or parse them as bytes; structured results are
+        serialized as JSON.
+
+        Args:
+            image_path: Path to image file
+            pattern_id: ImgGo pattern ID
+            idempotency_key: Optional idempotency key for retry safety
+
+        Returns:
+            Processed result as bytes
+        """
+        result = self.process_image(image_path, pattern_id, idempotency_key=idempotency_key)
+
+        if isinstance(result, bytes):
+            return result
+        if isinstance(result, str):
+            return result.encode("utf-8")
+        return json.dumps(result).encode("utf-8")
+
     def process_image_url(
         self,
         image_url: str,
@@ -113,13 +290,13 @@ class ImgGoClient:
             pattern_id: ImgGo pattern ID
             idempotency_key: Optional idempotency key
             poll: Whether to poll for results
-            webhook_url: Optional webhook URL
+            webhook_url: Optional webhook URL (disables polling)
 
         Returns:
-            Processed result data (if poll=True) or job info (if poll=False)
+            Processed result data (if poll=True) or job info (if poll=False or webhook_url set)
         """
         if not idempotency_key:
-            idempotency_key = f"url-{hash(image_url)}-{int(time.time())}"
+            idempotency_key = _url_idempotency_key(image_url)
 
         payload = {"image_url": image_url}
 
@@ -135,6 +312,9 @@ class ImgGoClient:
 
         job_id = response["data"]["job_id"]
 
+        if webhook_url:
+            return {"job_id": job_id, "webhook_url": webhook_url}
+
         if not poll:
             return response["data"]
 
@@ -150,23 +330,40 @@ class ImgGoClient:
         Returns:
             Job status data
         """
+        with self._status_lock:
+            entry = self._status_cache.get(job_id)
+        if entry and time.monotonic() - entry[0] < STATUS_CACHE_TTL:
+            return entry[1]
+
         response = self._make_request('GET', f"/jobs/{job_id}")
-        return response["data"]
+        data = response["data"]
+
+        with self._status_lock:
+            if data.get("status") in TERMINAL_STATUSES:
+                self._status_cache.pop(job_id, None)
+            else:
+                self._status_cache[job_id] = (time.monotonic(), data)
+
+        return data
 
     def wait_for_job(
         self,
         job_id: str,
-        max_attempts: int = 60,
-        wait_seconds: int = 2,
+        max_total_seconds: float = 300,
+        initial_wait: float = 0.25,
+        backoff_base: float = 1.3,
+        max_wait: float = 30.0,
         progress_callback: Optional[Callable[[str, int], None]] = None
     ) -> Dict[str, Any]:
         """
-        Poll job until completion
+        Poll job until completion with capped exponential backoff
 
         Args:
             job_id: Job ID to poll
-            max_attempts: Maximum polling attempts
-            wait_seconds: Seconds between polls
+            max_total_seconds: Maximum total time to wait for the job
+            initial_wait: Seconds to wait after the first poll
+            backoff_base: Growth factor applied to the wait after each poll
+            max_wait: Upper bound for a single wait between polls
             progress_callback: Optional callback for progress updates
 
         Returns:
@@ -176,7 +373,10 @@ class ImgGoClient:
             TimeoutError: If job doesn't complete in time
             RuntimeError: If job fails
         """
-        for attempt in range(max_attempts):
+        start = time.monotonic()
+        attempt = 0
+
+        while True:
             job_status = self.get_job_status(job_id)
             status = job_status["status"]
 
@@ -191,10 +391,16 @@ class ImgGoClient:
                 error = job_status.get("error", "Unknown error")
                 raise RuntimeError(f"Job {job_id} failed: {error}")
 
-            time.sleep(wait_seconds)
+            if time.monotonic() - start > max_total_seconds:
+                break
+
+            # Short jobs return quickly; long jobs are polled less often
+            wait = min(initial_wait * backoff_base ** attempt, max_wait)
+            time.sleep(wait + random.uniform(0, wait * 0.1))
+            attempt += 1
 
         raise TimeoutError(
-            f"Job {job_id} did not complete within {max_attempts * wait_seconds} seconds"
+            f"Job {job_id} did not complete within {max_total_seconds} seconds"
         )
 
     def _make_request(
@@ -219,67 +425,284 @@ class ImgGoClient:
         """
         url = f"{self.base_url}{endpoint}"
 
-        # Add authorization header
-        headers = kwargs.pop('headers', {})
-        headers['Authorization'] = f"Bearer {self.api_key}"
-
-        # Merge headers
-        if 'headers' in kwargs:
-            kwargs['headers'].update(headers)
-        else:
-            kwargs['headers'] = headers
+        # Authorization header is set once on the session
 
         # Add timeout
         kwargs.setdefault('timeout', self.timeout)
 
-        # Retry logic
-        last_exception = None
+        # Retries and backoff are handled by the session adapter
+        response = self._session.request(method, url, **kwargs)
+        response.raise_for_status()
+        return response.json()
+
+
+@lru_cache(maxsize=1)
+def shared_client() -> ImgGoClient:
+    """
+    One ImgGoClient for scripts that run several examples in a row
+
+    Every caller reuses the same pooled HTTP session, which is closed
+    when the interpreter exits.
+    """
+    client = ImgGoClient()
+    atexit.register(client.close)
+    return client
+
+
+class AsyncImgGoClient:
+    """
+    Asyncio ImgGo API client backed by httpx (HTTP/2, pooled connections)
+
+    Usage:
+        async with AsyncImgGoClient() as client:
+            results = await asyncio.gather(
+                *(client.process_image(p, pattern_id="pat_xxx") for p in paths)
+            )
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: str = "https://img-go.com/api",
+        timeout: int = 30,
+        max_retries: int = 3
+    ):
+        """
+        Initialize async ImgGo client
+
+        Args:
+            api_key: ImgGo API key (or set IMGGO_API_KEY env var)
+            base_url: API base URL
+            timeout: Request timeout in seconds
+            max_retries: Maximum connection retry attempts
+        """
+        if httpx is None:
+            raise ImportError("AsyncImgGoClient requires httpx. Install with: pip install 'httpx[http2]'")
 
-        for attempt in range(self.max_retries):
-            try:
-                response = requests.request(method, url, **kwargs)
-                response.raise_for_status()
-                return response.json()
+        self.api_key = api_key or os.getenv("IMGGO_API_KEY")
+        if not self.api_key:
+            raise ValueError("API key required. Set IMGGO_API_KEY or pass api_key parameter")
+
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.max_retries = max_retries
+
+        limits = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers={"Authorization": f"Bearer {self.api_key}"},
+            timeout=timeout,
+            transport=httpx.AsyncHTTPTransport(http2=True, limits=limits, retries=max_retries)
+        )
 
-            except requests.RequestException as e:
-                last_exception = e
+    async def aclose(self) -> None:
+        """Close the underlying HTTP client and its pooled connections"""
+        await self._client.aclose()
 
-                # Don't retry client errors (4xx except 429)
-                if hasattr(e, 'response') and e.response is not None:
-                    if 400 <= e.response.status_code < 500 and e.response.status_code != 429:
-                        raise
+    async def __aenter__(self) -> "AsyncImgGoClient":
+        return self
 
-                # Exponential backoff for retries
-                if attempt < self.max_retries - 1:
-                    wait_time = (2 ** attempt) * 0.5
-                    time.sleep(wait_time)
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.aclose()
 
-        # All retries failed
-        raise last_exception
+    async def process_image(
+        self,
+        image_path: str,
+        pattern_id: str,
+        idempotency_key: Optional[str] = None,
+        poll: bool = True,
+        webhook_url: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Process an image file with ImgGo
+
+        Args:
+            image_path: Path to image file
+            pattern_id: ImgGo pattern ID
+            idempotency_key: Optional idempotency key for retry safety
+            poll: Whether to poll for results (True) or return job_id immediately (False)
+            webhook_url: Optional webhook URL for async notification (disables polling)
+
+        Returns:
+            Processed result data (if poll=True) or job info (if poll=False or webhook_url set)
+        """
+        p = Path(image_path)
+
+        if not idempotency_key:
+            idempotency_key = f"{p.stem}-{int(time.time())}"
+
+        data = {'webhook_url': webhook_url} if webhook_url else None
+
+        with open(image_path, 'rb') as f:
+            response = await self._make_request(
+                'POST',
+                f"/patterns/{pattern_id}/ingest",
+                files={'image': (p.name, f, _guess_mime(p.suffix.lower()))},
+                data=data,
+                headers={"Idempotency-Key": idempotency_key}
+            )
+
+        job_id = response["data"]["job_id"]
+
+        if webhook_url:
+            return {"job_id": job_id, "webhook_url": webhook_url}
+
+        if not poll:
+            return response["data"]
+
+        return await self.wait_for_job(job_id)
+
+    async def process_image_url(
+        self,
+        image_url: str,
+        pattern_id: str,
+        idempotency_key: Optional[str] = None,
+        poll: bool = True,
+        webhook_url: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Process an image from URL with ImgGo
+
+        Args:
+            image_url: Public URL to image
+            pattern_id: ImgGo pattern ID
+            idempotency_key: Optional idempotency key
+            poll: Whether to poll for results
+            webhook_url: Optional webhook URL (disables polling)
+
+        Returns:
+            Processed result data (if poll=True) or job info (if poll=False or webhook_url set)
+        """
+        if not idempotency_key:
+            idempotency_key = _url_idempotency_key(image_url)
+
+        payload = {"image_url": image_url}
+
+        if webhook_url:
+            payload['webhook_url'] = webhook_url
+
+        response = await self._make_request(
+            'POST',
+            f"/patterns/{pattern_id}/ingest",
+            json=payload,
+            headers={"Idempotency-Key": idempotency_key}
+        )
+
+        job_id = response["data"]["job_id"]
+
+        if webhook_url:
+            return {"job_id": job_id, "webhook_url": webhook_url}
+
+        if not poll:
+            return response["data"]
+
+        return await self.wait_for_job(job_id)
+
+    async def get_job_status(self, job_id: str) -> Dict[str, Any]:
+        """
+        Get status of a processing job
+
+        Args:
+            job_id: Job ID from ingestion request
+
+        Returns:
+            Job status data
+        """
+        response = await self._make_request('GET', f"/jobs/{job_id}")
+        return response["data"]
+
+    async def wait_for_job(
+        self,
+        job_id: str,
+        max_total_seconds: float = 300,
+        initial_wait: float = 0.25,
+        backoff_base: float = 1.3,
+        max_wait: float = 30.0,
+        progress_callback: Optional[Callable[[str, int], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Poll job until completion with capped exponential backoff
+
+        Same contract as ImgGoClient.wait_for_job, but sleeps with asyncio.
+
+        Raises:
+            TimeoutError: If job doesn't complete in time
+            RuntimeError: If job fails
+        """
+        start = time.monotonic()
+        attempt = 0
+
+        while True:
+            job_status = await self.get_job_status(job_id)
+            status = job_status["status"]
+
+            if progress_callback:
+                progress_callback(status, attempt + 1)
+
+            if status in ("completed", "succeeded"):
+                return job_status.get("manifest") or job_status.get("result")
+
+            elif status == "failed":
+                error = job_status.get("error", "Unknown error")
+                raise RuntimeError(f"Job {job_id} failed: {error}")
+
+            if time.monotonic() - start > max_total_seconds:
+                break
+
+            wait = min(initial_wait * backoff_base ** attempt, max_wait)
+            await asyncio.sleep(wait + random.uniform(0, wait * 0.1))
+            attempt += 1
+
+        raise TimeoutError(
+            f"Job {job_id} did not complete within {max_total_seconds} seconds"
+        )
+
+    async def _make_request(
+        self,
+        method: str,
+        endpoint: str,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Make HTTP request
+
+        Args:
+            method: HTTP method (GET, POST, etc.)
+            endpoint: API endpoint path
+            **kwargs: Additional arguments for httpx
+
+        Returns:
+            JSON response data
+
+        Raises:
+            httpx.HTTPStatusError: If the API returns an error status
+        """
+        response = await self._client.request(method, endpoint, **kwargs)
+        response.raise_for_status()
+        return response.json()
 
 
 # Example usage
 if __name__ == "__main__":
-    # Initialize client
-    client = ImgGoClient()
+    # Initialize client (session is closed on exit)
+    with ImgGoClient() as client:
+        # Example 1: Process image file
+        print("Processing image file...")
+        result = client.process_image(
+            image_path="../../../test-images/invoice1.jpg",
+            pattern_id="pat_invoice_example"
+        )
+        print("Result:", result)
+
+        # Example 2: Process image from URL (no polling)
+        print("\nProcessing image from URL...")
+        job_info = client.process_image_url(
+            image_url="https://example.com/image.jpg",
+            pattern_id="pat_example",
+            poll=False  # Return job ID immediately
+        )
+        print("Job ID:", job_info['job_id'])
 
-    # Example 1: Process image file
-    print("Processing image file...")
-    result = client.process_image(
-        image_path="../../../test-images/invoice1.jpg",
-        pattern_id="pat_invoice_example"
-    )
-    print("Result:", result)
-
-    # Example 2: Process image from URL (no polling)
-    print("\nProcessing image from URL...")
-    job_info = client.process_image_url(
-        image_url="https://example.com/image.jpg",
-        pattern_id="pat_example",
-        poll=False  # Return job ID immediately
-    )
-    print("Job ID:", job_info['job_id'])
-
-    # Later, check status
-    status = client.get_job_status(job_info['job_id'])
-    print("Status:", status['status'])
+        # Later, check status
+        status = client.get_job_status(job_info['job_id'])
+        print("Status:", status['status'])
@@ -0,0 +1,37 @@
+"""
+JSON helpers shared by the examples
+Use orjson when it is installed, else the stdlib json module
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def json_loads(raw):
+    """Parse JSON text or bytes"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def json_dumps(obj) -> bytes:
+    """Compact JSON as UTF-8 bytes"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+
+def json_dumps_indented(obj) -> bytes:
+    """
+    Indented JSON as UTF-8 bytes, for writing to files opened in 'wb' mode
+
+    Non-ASCII text is kept as raw UTF-8, so print json.dumps(obj, indent=2)
+    instead of decoding this when the output goes to a console.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode("utf-8")
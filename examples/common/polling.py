@@ -0,0 +1,40 @@
+"""
+Job polling schedule shared by the language examples
+Start fast, back off exponentially up to a cap, and never sleep past the deadline
+"""
+
+from typing import Mapping, Optional
+
+
+# Polling: start fast and back off exponentially up to a cap
+POLL_INITIAL_DELAY = 0.25
+POLL_MAX_DELAY = 5.0
+POLL_BACKOFF = 1.7
+
+
+def poll_wait(headers: Mapping[str, str], delay: float, remaining: float) -> float:
+    """
+    Seconds to sleep before the next poll
+
+    Honors a numeric Retry-After header, but never sleeps longer than
+    POLL_MAX_DELAY or past the time left before the caller's deadline.
+
+    Args:
+        headers: Response headers from the last poll
+        delay: Current backoff delay
+        remaining: Seconds left before the deadline
+
+    Returns:
+        Seconds to sleep (0 when the deadline has passed)
+    """
+    retry_after: Optional[str] = headers.get("Retry-After")
+    try:
+        wait = float(retry_after) if retry_after else delay
+    except ValueError:
+        wait = delay
+    return max(min(wait, POLL_MAX_DELAY, remaining), 0.0)
+
+
+def next_delay(delay: float) -> float:
+    """Backoff delay for the poll after this one"""
+    return min(delay * POLL_BACKOFF, POLL_MAX_DELAY)
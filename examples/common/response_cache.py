@@ -0,0 +1,163 @@
+"""
+Disk-backed cache for ImgGo processing results
+Re-running an example with the same image and pattern reads the stored
+result instead of calling the API again. Stored results expire after
+IMGGO_CACHE_TTL seconds; set IMGGO_NO_CACHE=1 to ignore them entirely
+(e.g. after editing a pattern)
+"""
+
+import os
+import json
+import time
+import hashlib
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Union
+
+
+# Cache location (override with IMGGO_CACHE_DIR)
+CACHE_DIR = Path(os.getenv("IMGGO_CACHE_DIR", ".cache/imggo"))
+
+# Stored results older than this many seconds are refetched (0 keeps them forever)
+CACHE_TTL = float(os.getenv("IMGGO_CACHE_TTL", "86400"))
+
+# Skip stored results and always call the API; fresh results are still stored
+NO_CACHE = os.getenv("IMGGO_NO_CACHE", "").lower() in ("1", "true", "yes")
+
+# In-process layer so repeated lookups in one run skip the disk
+_memory_cache: Dict[str, Any] = {}
+
+# Image path -> SHA-256, filled on first use so each file is read and hashed once per run
+_IMAGE_HASHES: Dict[str, str] = {}
+
+# Sentinel for "not cached" (None is a valid stored result)
+_MISSING = object()
+
+
+def file_digest(image_path: Union[str, Path]) -> str:
+    """SHA-256 hex digest of a file's contents (memoized per path)"""
+    path_key = str(Path(image_path).resolve())
+
+    digest = _IMAGE_HASHES.get(path_key)
+    if digest is None:
+        with open(image_path, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        _IMAGE_HASHES[path_key] = digest
+
+    return digest
+
+
+def _load(key: str) -> Any:
+    """Stored result for a cache key, or _MISSING"""
+    # Results fetched earlier in this run are always reused
+    if key in _memory_cache:
+        return _memory_cache[key]
+
+    if NO_CACHE:
+        return _MISSING
+
+    cache_file = CACHE_DIR / f"{key}.json"
+    try:
+        age = time.time() - cache_file.stat().st_mtime
+    except FileNotFoundError:
+        return _MISSING
+
+    if CACHE_TTL and age > CACHE_TTL:
+        return _MISSING
+
+    with open(cache_file, 'r', encoding='utf-8') as f:
+        result = json.load(f)
+
+    _memory_cache[key] = result
+    return result
+
+
+def _store(key: str, result: Any) -> None:
+    """Persist a result under a cache key"""
+    # Write to a temp file and rename so concurrent runs never see partial JSON
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile('w', dir=CACHE_DIR, suffix='.tmp',
+                                     delete=False, encoding='utf-8') as f:
+        json.dump(result, f)
+    os.replace(f.name, CACHE_DIR / f"{key}.json")
+
+    _memory_cache[key] = result
+
+
+def load_result(digest: str, pattern_id: str, default: Any = None) -> Any:
+    """
+    Stored result for an image digest and pattern, or default
+
+    For callers that hash images themselves (e.g. off the event loop) and
+    call the API on their own; pair with store_result.
+
+    Args:
+        digest: Image digest from file_digest
+        pattern_id: ImgGo pattern ID
+        default: Returned when nothing fresh is stored
+
+    Returns:
+        Stored result data, or default
+    """
+    result = _load(f"{digest}_{pattern_id}")
+    return default if result is _MISSING else result
+
+
+def store_result(digest: str, pattern_id: str, result: Any) -> None:
+    """Persist a result for an image digest and pattern"""
+    _store(f"{digest}_{pattern_id}", result)
+
+
+def _print_cache_note(image_path: Union[str, Path]) -> None:
+    """Tell the user a result came from an earlier run rather than the API"""
+    print(f"  (cached result for {Path(image_path).name}; set IMGGO_NO_CACHE=1 to refresh)")
+
+
+def cached_process_image(client, image_path: Union[str, Path], pattern_id: str) -> Any:
+    """
+    Process an image, reusing a stored result for identical image bytes
+
+    Args:
+        client: ImgGoClient instance used on a cache miss
+        image_path: Path to image file
+        pattern_id: ImgGo pattern ID
+
+    Returns:
+        Processed result data (same as client.process_image)
+    """
+    key = f"{file_digest(image_path)}_{pattern_id}"
+    from_disk = key not in _memory_cache
+
+    result = _load(key)
+    if result is _MISSING:
+        result = client.process_image(str(image_path), pattern_id)
+        _store(key, result)
+    elif from_disk:
+        _print_cache_note(image_path)
+
+    return result
+
+
+async def cached_process_image_async(client, image_path: Union[str, Path], pattern_id: str) -> Any:
+    """
+    Async variant of cached_process_image for AsyncImgGoClient
+
+    Args:
+        client: AsyncImgGoClient instance used on a cache miss
+        image_path: Path to image file
+        pattern_id: ImgGo pattern ID
+
+    Returns:
+        Processed result data (same as client.process_image)
+    """
+    key = f"{file_digest(image_path)}_{pattern_id}"
+    from_disk = key not in _memory_cache
+
+    result = _load(key)
+    if result is _MISSING:
+        result = await client.process_image(str(image_path), pattern_id)
+        _store(key, result)
+    elif from_disk:
+        _print_cache_note(image_path)
+
+    return result
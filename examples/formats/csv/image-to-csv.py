@@ -7,12 +7,46 @@ import os
 import sys
 from pathlib import Path
 import csv
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+# examples/formats/csv -> examples
+EXAMPLES_DIR = Path(__file__).resolve().parents[2]
+TEST_IMAGES = EXAMPLES_DIR / "test-images"
 
 # Add common utilities to path
-sys.path.append(str(Path(__file__).parent.parent / "common"))
+sys.path.append(str(EXAMPLES_DIR / "common"))
 
 from imggo_client import ImgGoClient
 
+# Concurrent uploads for batch examples (override with IMGGO_MAX_WORKERS)
+MAX_WORKERS = int(os.getenv("IMGGO_MAX_WORKERS", "8"))
+
+# Buffer size for consolidated batch output (fewer write syscalls)
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+
+def _coerce_rows(result):
+    """
+    Normalize an API result to an iterable of row dicts
+
+    Structured results (list or dict) are used as-is; CSV text is parsed
+    lazily, so callers that only iterate never hold every row at once.
+    An empty (None) result has no rows.
+
+    Raises:
+        TypeError: If the result is not CSV text, a list, a dict or None
+    """
+    if result is None:
+        return []
+    if isinstance(result, list):
+        return result
+    if isinstance(result, dict):
+        return [result]
+    if isinstance(result, str):
+        return csv.DictReader(io.StringIO(result))
+    raise TypeError(f"unexpected result type: {type(result).__name__}")
+
 
 def example_inventory_to_csv():
     """
@@ -22,46 +56,43 @@ def example_inventory_to_csv():
     print("EXAMPLE 1: Inventory Photo → CSV")
     print("="*60)
 
-    client = ImgGoClient()
+    with ImgGoClient() as client:
+        # Pattern for inventory counting (CSV output)
+        # Create at img-go.com/patterns with:
+        # - Instructions: "Count all visible products, extract SKU, product name, and quantity on shelf"
+        # - Output format: CSV
+        # - CSV headers: SKU, Product_Name, Quantity, Location
+        PATTERN_ID = "pat_inventory_csv"
 
-    # Pattern for inventory counting (CSV output)
-    # Create at img-go.com/patterns with:
-    # - Instructions: "Count all visible products, extract SKU, product name, and quantity on shelf"
-    # - Output format: CSV
-    # - CSV headers: SKU, Product_Name, Quantity, Location
-    PATTERN_ID = "pat_inventory_csv"
+        # Using construction image as example (pretend it's warehouse)
+        inventory_path = TEST_IMAGES / "construction1.jpg"
 
-    # Using construction image as example (pretend it's warehouse)
-    inventory_path = Path(__file__).parent.parent.parent / "test-images" / "construction1.jpg"
+        print(f"\nProcessing: {inventory_path.name}")
 
-    print(f"\nProcessing: {inventory_path.name}")
-
-    try:
-        result = client.process_image(
-            image_path=str(inventory_path),
-            pattern_id=PATTERN_ID
-        )
+        try:
+            result = client.process_image(
+                image_path=str(inventory_path),
+                pattern_id=PATTERN_ID
+            )
 
-        # Result is CSV string
-        print("\nExtracted CSV:")
-        print(result)
+            # Result is CSV string
+            print("\nExtracted CSV:")
+            print(result)
 
-        # Save to file
-        output_file = "inventory_count.csv"
-        with open(output_file, 'w', newline='') as f:
-            f.write(result)
+            # Save to file
+            output_file = "inventory_count.csv"
+            with open(output_file, 'w', newline='') as f:
+                f.write(result)
 
-        print(f"\n✓ Saved to {output_file}")
+            print(f"\n✓ Saved to {output_file}")
 
-        # Parse and display summary
-        import io
-        csv_data = csv.DictReader(io.StringIO(result))
-        rows = list(csv_data)
+            # Parse and display summary
+            count = sum(1 for _ in _coerce_rows(result))
 
-        print(f"\nSummary: {len(rows)} items counted")
+            print(f"\nSummary: {count} items counted")
 
-    except Exception as e:
-        print(f"\n✗ Error: {e}")
+        except Exception as e:
+            print(f"\n✗ Error: {e}")
 
 
 def example_inspection_to_csv():
@@ -72,36 +103,35 @@ def example_inspection_to_csv():
     print("EXAMPLE 2: Inspection Photo → CSV Report")
     print("="*60)
 
-    client = ImgGoClient()
-
-    # Pattern for inspection violations
-    # Instructions: "Identify all violations, extract violation code, description, and severity"
-    # Output: CSV with headers: Violation_Code, Description, Severity, Location, Corrected
-    PATTERN_ID = "pat_inspection_csv"
+    with ImgGoClient() as client:
+        # Pattern for inspection violations
+        # Instructions: "Identify all violations, extract violation code, description, and severity"
+        # Output: CSV with headers: Violation_Code, Description, Severity, Location, Corrected
+        PATTERN_ID = "pat_inspection_csv"
 
-    # Using document classification image as example
-    inspection_path = Path(__file__).parent.parent.parent / "test-images" / "document-classification2.png"
+        # Using document classification image as example
+        inspection_path = TEST_IMAGES / "document-classification2.png"
 
-    print(f"\nProcessing: {inspection_path.name}")
+        print(f"\nProcessing: {inspection_path.name}")
 
-    try:
-        result = client.process_image(
-            image_path=str(inspection_path),
-            pattern_id=PATTERN_ID
-        )
+        try:
+            result = client.process_image(
+                image_path=str(inspection_path),
+                pattern_id=PATTERN_ID
+            )
 
-        print("\nInspection Report CSV:")
-        print(result)
+            print("\nInspection Report CSV:")
+            print(result)
 
-        # Save to file
-        output_file = "inspection_report.csv"
-        with open(output_file, 'w', newline='') as f:
-            f.write(result)
+            # Save to file
+            output_file = "inspection_report.csv"
+            with open(output_file, 'w', newline='') as f:
+                f.write(result)
 
-        print(f"\n✓ Saved to {output_file}")
+            print(f"\n✓ Saved to {output_file}")
 
-    except Exception as e:
-        print(f"\n✗ Error: {e}")
+        except Exception as e:
+            print(f"\n✗ Error: {e}")
 
 
 def example_expense_receipts_to_csv():
@@ -112,61 +142,86 @@ def example_expense_receipts_to_csv():
     print("EXAMPLE 3: Multiple Receipts → Consolidated CSV")
     print("="*60)
 
-    client = ImgGoClient()
-
-    # Pattern for receipt extraction
-    # Instructions: "Extract merchant, date, total amount, and category from receipt"
-    # Output: CSV with headers: Date, Merchant, Category, Amount
-    PATTERN_ID = "pat_receipt_csv"
-
-    test_images_dir = Path(__file__).parent.parent.parent / "test-images"
-
-    # Using invoice images as receipt examples
-    receipt_images = list(test_images_dir.glob("invoice*.jpg"))[:3]
-
-    print(f"\nProcessing {len(receipt_images)} receipts...")
-
-    all_rows = []
-
-    for img_path in receipt_images:
-        print(f"\n  Processing: {img_path.name}... ", end='')
-
-        try:
-            result = client.process_image(
-                image_path=str(img_path),
-                pattern_id=PATTERN_ID
-            )
-
-            # Parse CSV result
-            import io
-            csv_data = csv.DictReader(io.StringIO(result))
-            rows = list(csv_data)
-
-            all_rows.extend(rows)
-
-            print(f"✓ ({len(rows)} items)")
-
-        except Exception as e:
-            print(f"✗ ({e})")
-
-    # Save consolidated CSV
-    if all_rows:
-        output_file = "expense_report_consolidated.csv"
-
-        with open(output_file, 'w', newline='') as f:
-            if all_rows:
-                writer = csv.DictWriter(f, fieldnames=all_rows[0].keys())
-                writer.writeheader()
+    with ImgGoClient() as client:
+        # Pattern for receipt extraction
+        # Instructions: "Extract merchant, date, total amount, and category from receipt"
+        # Output: CSV with headers: Date, Merchant, Category, Amount
+        PATTERN_ID = "pat_receipt_csv"
+
+        # Using invoice images as receipt examples
+        receipt_images = sorted(TEST_IMAGES.glob("invoice*.jpg"))[:3]
+
+        print(f"\nProcessing {len(receipt_images)} receipts...")
+
+        combined_header = None
+        all_rows = []
+
+        # Uploads are network-bound, so run them concurrently; results are
+        # read in receipt order so rows and the header are the same every run
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            futures = [
+                (img_path, executor.submit(client.process_image, str(img_path), PATTERN_ID))
+                for img_path in receipt_images
+            ]
+
+            for img_path, future in futures:
+
+                try:
+                    result = future.result()
+
+                    if not isinstance(result, str):
+                        # Structured result: flatten dicts onto the shared header
+                        # (None has no rows; unsupported types raise TypeError)
+                        rows = _coerce_rows(result)
+                        if not rows:
+                            print(f"\n  {img_path.name}: ✗ (empty result)")
+                            continue
+                        if not combined_header:
+                            combined_header = list(rows[0].keys())
+                        all_rows.extend([row.get(col, '') for col in combined_header] for row in rows)
+                        print(f"\n  {img_path.name}: ✓ ({len(rows)} items)")
+                        continue
+
+                    # Parse CSV result as plain row lists
+                    reader = csv.reader(io.StringIO(result))
+                    header = next(reader, None)
+                    if header is None:
+                        print(f"\n  {img_path.name}: ✗ (empty result)")
+                        continue
+
+                    if not combined_header:
+                        combined_header = header
+
+                    before = len(all_rows)
+                    all_rows.extend(reader)
+
+                    print(f"\n  {img_path.name}: ✓ ({len(all_rows) - before} items)")
+
+                except Exception as e:
+                    print(f"\n  {img_path.name}: ✗ ({e})")
+
+        # Save consolidated CSV
+        if all_rows:
+            output_file = "expense_report_consolidated.csv"
+
+            with open(output_file, 'w', newline='', buffering=WRITE_BUFFER_SIZE, encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(combined_header)
                 writer.writerows(all_rows)
 
-        print(f"\n✓ Consolidated {len(all_rows)} expenses to {output_file}")
+            print(f"\n✓ Consolidated {len(all_rows)} expenses to {output_file}")
 
-        # Calculate totals
-        total = sum(float(row.get('Amount', 0) or 0) for row in all_rows)
-        print(f"  Total Expenses: ${total:,.2f}")
+            # Calculate totals
+            if 'Amount' in combined_header:
+                amount_idx = combined_header.index('Amount')
+                total = sum(
+                    float(row[amount_idx] or 0)
+                    for row in all_rows if len(row) > amount_idx
+                )
+                print(f"  Total Expenses: ${total:,.2f}")
 
-    else:
-        print("\n✗ No data to consolidate")
+        else:
+            print("\n✗ No data to consolidate")
 
 
 def example_csv_to_database():
@@ -177,71 +232,73 @@ def example_csv_to_database():
     print("EXAMPLE 4: Image → CSV → SQLite Database")
     print("="*60)
 
-    client = ImgGoClient()
-    PATTERN_ID = "pat_inventory_csv"
+    with ImgGoClient() as client:
+        PATTERN_ID = "pat_inventory_csv"
 
-    inventory_path = Path(__file__).parent.parent.parent / "test-images" / "construction1.jpg"
+        inventory_path = TEST_IMAGES / "construction1.jpg"
 
-    print(f"\nProcessing: {inventory_path.name}")
+        print(f"\nProcessing: {inventory_path.name}")
 
-    try:
-        result = client.process_image(
-            image_path=str(inventory_path),
-            pattern_id=PATTERN_ID
-        )
-
-        # Create SQLite database
-        import sqlite3
-        import io
-
-        db_file = "inventory.db"
-        conn = sqlite3.connect(db_file)
-        cursor = conn.cursor()
-
-        # Create table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS inventory (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                sku TEXT,
-                product_name TEXT,
-                quantity INTEGER,
-                location TEXT,
-                counted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        try:
+            result = client.process_image(
+                image_path=str(inventory_path),
+                pattern_id=PATTERN_ID
             )
-        """)
-
-        # Parse CSV and insert
-        csv_data = csv.DictReader(io.StringIO(result))
-
-        for row in csv_data:
-            cursor.execute("""
-                INSERT INTO inventory (sku, product_name, quantity, location)
-                VALUES (?, ?, ?, ?)
-            """, (
-                row.get('SKU', ''),
-                row.get('Product_Name', ''),
-                row.get('Quantity', 0),
-                row.get('Location', '')
-            ))
 
-        conn.commit()
+            # Create SQLite database
+            import sqlite3
+
+            db_file = "inventory.db"
+            conn = sqlite3.connect(db_file)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            cursor = conn.cursor()
+
+            # Normalize result rows and insert them in a single transaction
+            csv_data = _coerce_rows(result)
+
+            with conn:
+                # Create table
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS inventory (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        sku TEXT,
+                        product_name TEXT,
+                        quantity INTEGER,
+                        location TEXT,
+                        counted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                """)
+
+                cursor.executemany("""
+                    INSERT INTO inventory (sku, product_name, quantity, location)
+                    VALUES (?, ?, ?, ?)
+                """, (
+                    (
+                        row.get('SKU', ''),
+                        row.get('Product_Name', ''),
+                        row.get('Quantity', 0),
+                        row.get('Location', '')
+                    )
+                    for row in csv_data
+                ))
+
+            # Query results
+            cursor.execute("SELECT COUNT(*) FROM inventory")
+            count = cursor.fetchone()[0]
+
+            print(f"\n✓ Imported {count} items to {db_file}")
+
+            # Show sample
+            cursor.execute("SELECT * FROM inventory LIMIT 3")
+            print("\nSample rows:")
+            for row in cursor.fetchall():
+                print(f"  {row}")
+
+            conn.close()
 
-        # Query results
-        cursor.execute("SELECT COUNT(*) FROM inventory")
-        count = cursor.fetchone()[0]
-
-        print(f"\n✓ Imported {count} items to {db_file}")
-
-        # Show sample
-        cursor.execute("SELECT * FROM inventory LIMIT 3")
-        print("\nSample rows:")
-        for row in cursor.fetchall():
-            print(f"  {row}")
-
-        conn.close()
-
-    except Exception as e:
-        print(f"\n✗ Error: {e}")
+        except Exception as e:
+            print(f"\n✗ Error: {e}")
 
 
 def main():
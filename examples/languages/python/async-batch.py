@@ -11,19 +11,91 @@ Usage:
 import os
 import sys
 import asyncio
+import mimetypes
+from contextlib import ExitStack
 import aiohttp
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, NamedTuple, Tuple
+
+# Shared JSON helpers, polling schedule and result cache
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent / "common"))
+from json_utils import json_loads, json_dumps
+from polling import POLL_INITIAL_DELAY, poll_wait, next_delay
+from response_cache import file_digest, load_result, store_result
+
+# Faster libuv-based event loop when installed (not available on Windows)
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 
 
 # Configuration
 IMGGO_API_KEY = os.getenv("IMGGO_API_KEY")
 IMGGO_BASE_URL = os.getenv("IMGGO_BASE_URL", "https://img-go.com/api")
 
+# Wait on the job event stream instead of polling (falls back to polling if unsupported)
+USE_JOB_EVENTS = os.getenv("IMGGO_JOB_EVENTS", "").lower() in ("1", "true", "yes")
+
+# Submit the whole batch in one multipart request (falls back to per-file uploads if unsupported)
+USE_BATCH_INGEST = os.getenv("IMGGO_BATCH_INGEST", "").lower() in ("1", "true", "yes")
+
+# Poll all in-flight jobs with one batch request per round (falls back to per-job polling if unsupported)
+USE_BATCH_POLL = os.getenv("IMGGO_BATCH_POLL", "").lower() in ("1", "true", "yes")
+
+# Maximum uploads in flight at once
+MAX_CONCURRENCY = int(os.getenv("IMGGO_MAX_CONCURRENCY", "16"))
+
+def create_session() -> aiohttp.ClientSession:
+    """
+    Create an authenticated session with a keep-alive connection pool.
+
+    Reuse one session for every batch so uploads and polls share
+    connections instead of repeating TCP/TLS handshakes.
+
+    Returns:
+        aiohttp.ClientSession: Session to pass to process_batch
+    """
+    if not IMGGO_API_KEY:
+        raise ValueError("IMGGO_API_KEY environment variable not set")
+
+    connector = aiohttp.TCPConnector(
+        limit=64,
+        limit_per_host=16,
+        ttl_dns_cache=300,
+        keepalive_timeout=75
+    )
+
+    # Requests use paths relative to the API root, parsed once here
+    return aiohttp.ClientSession(
+        base_url=IMGGO_BASE_URL.rstrip("/") + "/",
+        headers={"Authorization": f"Bearer {IMGGO_API_KEY}"},
+        connector=connector
+    )
+
+
+class PreparedImage(NamedTuple):
+    """Per-image metadata computed once before any upload starts"""
+    path: str
+    name: str
+    mime_type: str
+    size: int
+
+
+def prepare_image(image_path: str) -> PreparedImage:
+    """Resolve the upload filename, MIME type and size for an image path"""
+    mime_type, _ = mimetypes.guess_type(image_path)
+    return PreparedImage(
+        path=image_path,
+        name=os.path.basename(image_path),
+        mime_type=mime_type or 'image/jpeg',
+        size=os.path.getsize(image_path)
+    )
+
 
 async def upload_image_async(
     session: aiohttp.ClientSession,
-    image_path: str,
+    image: PreparedImage,
     pattern_id: str
 ) -> Dict[str, Any]:
     """
@@ -31,46 +103,42 @@ async def upload_image_async(
 
     Args:
         session: aiohttp session
-        image_path: Path to image file
+        image: Image from prepare_image()
         pattern_id: Pattern ID to use
 
     Returns:
         dict: Result with job_id, image_path, and status
     """
+    image_path = image.path
     try:
-        print(f"Uploading: {Path(image_path).name}")
+        print(f"Uploading: {image.name} ({image.size / 1024:.0f} KB)")
 
-        # Read file
+        # Stream the file from disk in chunks instead of reading it into memory;
+        # aiohttp sets Content-Length from the file size
         with open(image_path, 'rb') as f:
-            file_data = f.read()
-
-        # Guess MIME type
-        import mimetypes
-        mime_type, _ = mimetypes.guess_type(image_path)
-
-        # Create form data
-        data = aiohttp.FormData()
-        data.add_field('image',
-                      file_data,
-                      filename=Path(image_path).name,
-                      content_type=mime_type or 'image/jpeg')
-
-        # Upload
-        async with session.post(
-            f"{IMGGO_BASE_URL}/patterns/{pattern_id}/ingest",
-            data=data
-        ) as response:
-            response.raise_for_status()
-            result = await response.json()
+            # Create form data
+            data = aiohttp.FormData()
+            data.add_field('image',
+                          f,
+                          filename=image.name,
+                          content_type=image.mime_type)
+
+            # Upload
+            async with session.post(
+                f"patterns/{pattern_id}/ingest",
+                data=data
+            ) as response:
+                response.raise_for_status()
+                result = await response.json(loads=json_loads)
 
-            job_id = result["data"]["job_id"]
-            print(f"  Created job: {job_id}")
+        job_id = result["data"]["job_id"]
+        print(f"  Created job: {job_id}")
 
-            return {
-                "job_id": job_id,
-                "image_path": image_path,
-                "status": "uploaded"
-            }
+        return {
+            "job_id": job_id,
+            "image_path": image_path,
+            "status": "uploaded"
+        }
 
     except Exception as e:
         print(f"  Error uploading {image_path}: {e}")
@@ -82,37 +150,100 @@ async def upload_image_async(
         }
 
 
+async def ingest_batch_async(
+    session: aiohttp.ClientSession,
+    images: List[PreparedImage],
+    pattern_id: str
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Upload all images in a single multipart request.
+
+    Args:
+        session: aiohttp session
+        images: Images from prepare_image()
+        pattern_id: Pattern ID to use
+
+    Returns:
+        list: Upload results in the same order as images, or None if
+        the server does not support batch ingest (caller should upload per file)
+    """
+    image_paths = [image.path for image in images]
+    try:
+        print(f"Uploading {len(images)} images in one request")
+
+        with ExitStack() as stack:
+            data = aiohttp.FormData()
+            for image in images:
+                data.add_field('image',
+                              stack.enter_context(open(image.path, 'rb')),
+                              filename=image.name,
+                              content_type=image.mime_type)
+
+            async with session.post(
+                f"patterns/{pattern_id}/ingest:batch",
+                data=data
+            ) as response:
+                if response.status in (404, 415):
+                    return None
+
+                response.raise_for_status()
+                result = await response.json(loads=json_loads)
+
+        # Job IDs come back positionally, one per uploaded image
+        job_ids = result["data"]["job_ids"]
+
+        return [
+            {"job_id": job_id, "image_path": image_path, "status": "uploaded"}
+            for image_path, job_id in zip(image_paths, job_ids)
+        ]
+
+    except Exception as e:
+        print(f"  Error uploading batch: {e}")
+        return [
+            {"job_id": None, "image_path": image_path, "status": "error", "error": str(e)}
+            for image_path in image_paths
+        ]
+
+
 async def poll_job_async(
     session: aiohttp.ClientSession,
     job_id: str,
     image_path: str,
-    max_attempts: int = 60
+    timeout: float = 120.0
 ) -> Dict[str, Any]:
     """
     Poll a job asynchronously until completion.
 
+    Checks quickly at first, then backs off exponentially (up to
+    POLL_MAX_DELAY seconds) unless the server sends Retry-After.
+
     Args:
         session: aiohttp session
         job_id: Job ID to poll
         image_path: Original image path (for tracking)
-        max_attempts: Maximum polling attempts
+        timeout: Maximum seconds to wait for the job
 
     Returns:
         dict: Result with extracted data
     """
+    image_name = os.path.basename(image_path)
     try:
-        for attempt in range(max_attempts):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        delay = POLL_INITIAL_DELAY
+
+        while loop.time() < deadline:
             async with session.get(
-                f"{IMGGO_BASE_URL}/jobs/{job_id}"
+                f"jobs/{job_id}"
             ) as response:
                 response.raise_for_status()
-                data = await response.json()
+                data = await response.json(loads=json_loads)
 
                 status = data["data"]["status"]
 
                 if status == "succeeded":
                     result = data["data"].get("manifest") or data["data"].get("result")
-                    print(f"  Completed: {Path(image_path).name}")
+                    print(f"  Completed: {image_name}")
 
                     return {
                         "job_id": job_id,
@@ -123,7 +254,7 @@ async def poll_job_async(
 
                 elif status == "failed":
                     error = data["data"].get("error", "Unknown error")
-                    print(f"  Failed: {Path(image_path).name} - {error}")
+                    print(f"  Failed: {image_name} - {error}")
 
                     return {
                         "job_id": job_id,
@@ -132,11 +263,14 @@ async def poll_job_async(
                         "error": error
                     }
 
-                # Still processing
-                await asyncio.sleep(2)
+                wait = poll_wait(response.headers, delay, deadline - loop.time())
+
+            # Still processing
+            await asyncio.sleep(wait)
+            delay = next_delay(delay)
 
         # Timeout
-        print(f"  Timeout: {Path(image_path).name}")
+        print(f"  Timeout: {image_name}")
         return {
             "job_id": job_id,
             "image_path": image_path,
@@ -153,9 +287,254 @@ async def poll_job_async(
         }
 
 
+async def stream_job_async(
+    session: aiohttp.ClientSession,
+    job_id: str,
+    image_path: str,
+    timeout: float = 120.0
+) -> Dict[str, Any]:
+    """
+    Wait for a job over a Server-Sent Events stream.
+
+    Holds one connection open until the first succeeded/failed event
+    instead of issuing repeated GETs. Falls back to poll_job_async when
+    the server does not offer a job event stream.
+
+    Args:
+        session: aiohttp session
+        job_id: Job ID to wait for
+        image_path: Original image path (for tracking)
+        timeout: Maximum seconds to wait for the job
+
+    Returns:
+        dict: Result with extracted data
+    """
+    image_name = os.path.basename(image_path)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+
+    def remaining() -> float:
+        # A polling fallback only gets what is left of the overall budget
+        return max(deadline - loop.time(), 0.0)
+
+    try:
+        async with session.get(
+            f"jobs/{job_id}/events",
+            headers={"Accept": "text/event-stream"},
+            timeout=aiohttp.ClientTimeout(total=timeout)
+        ) as response:
+            if (response.status in (404, 406)
+                    or not response.content_type.startswith("text/event-stream")):
+                return await poll_job_async(session, job_id, image_path, remaining())
+
+            response.raise_for_status()
+
+            async for raw_line in response.content:
+                line = raw_line.decode("utf-8").strip()
+                if not line.startswith("data:"):
+                    continue
+
+                event = json_loads(line[5:])
+                job = event.get("data", event)
+                status = job.get("status")
+
+                if status == "succeeded":
+                    print(f"  Completed: {image_name}")
+                    return {
+                        "job_id": job_id,
+                        "image_path": image_path,
+                        "status": "completed",
+                        "result": job.get("manifest") or job.get("result")
+                    }
+
+                elif status == "failed":
+                    error = job.get("error", "Unknown error")
+                    print(f"  Failed: {image_name} - {error}")
+                    return {
+                        "job_id": job_id,
+                        "image_path": image_path,
+                        "status": "failed",
+                        "error": error
+                    }
+
+        # Stream ended before a terminal event; finish by polling
+        return await poll_job_async(session, job_id, image_path, remaining())
+
+    except asyncio.TimeoutError:
+        print(f"  Timeout: {image_name}")
+        return {
+            "job_id": job_id,
+            "image_path": image_path,
+            "status": "timeout"
+        }
+
+    except Exception as e:
+        print(f"  Error streaming {job_id}: {e}")
+        return {
+            "job_id": job_id,
+            "image_path": image_path,
+            "status": "error",
+            "error": str(e)
+        }
+
+
+async def poll_many(
+    session: aiohttp.ClientSession,
+    job_ids: List[str]
+) -> Optional[Dict[str, Dict[str, Any]]]:
+    """
+    Fetch the status of several jobs in one request.
+
+    Args:
+        session: aiohttp session
+        job_ids: Job IDs to look up
+
+    Returns:
+        dict: Job data keyed by job ID, or None if batch lookup is not supported
+    """
+    async with session.post(
+        # Leading "./" keeps "jobs:" from being read as a URL scheme
+        "./jobs:batchGet",
+        data=json_dumps({"ids": job_ids}),
+        headers={"Content-Type": "application/json"}
+    ) as response:
+        if response.status in (404, 405):
+            return None
+        response.raise_for_status()
+        data = await response.json(loads=json_loads)
+
+    jobs = data["data"]
+    if isinstance(jobs, list):
+        jobs = {job["id"]: job for job in jobs}
+    return jobs
+
+
+class BatchPoller:
+    """
+    Shares one poll loop across every in-flight job.
+
+    Each round sends a single poll_many request for all pending jobs and
+    resolves the matching futures, so request volume stays flat as the
+    batch grows. Falls back to poll_job_async if batch lookup is unsupported.
+    """
+
+    def __init__(self, session: aiohttp.ClientSession, timeout: float = 120.0):
+        self.session = session
+        self.timeout = timeout
+        self.supported = True
+        self._waiters: Dict[str, Tuple[str, float, asyncio.Future]] = {}
+        self._task: Optional[asyncio.Task] = None
+        # Strong references to fallback pollers so they are not garbage collected
+        self._single_tasks = set()
+
+    async def wait(self, job_id: str, image_path: str) -> Dict[str, Any]:
+        """Wait for a job to finish and return its result record"""
+        if not self.supported:
+            return await poll_job_async(self.session, job_id, image_path, self.timeout)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._waiters[job_id] = (image_path, loop.time() + self.timeout, future)
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        delay = POLL_INITIAL_DELAY
+
+        while self._waiters:
+            # Sleeping first also lets concurrent uploads join the same round
+            await asyncio.sleep(delay)
+            job_ids = list(self._waiters)
+
+            try:
+                jobs = await poll_many(self.session, job_ids)
+            except Exception as e:
+                # Treat as transient: back off and retry the round, erroring only expired jobs
+                print(f"  Error polling batch: {e}")
+                now = loop.time()
+                for job_id in job_ids:
+                    image_path, deadline, future = self._waiters[job_id]
+                    if now >= deadline:
+                        del self._waiters[job_id]
+                        future.set_result({
+                            "job_id": job_id,
+                            "image_path": image_path,
+                            "status": "error",
+                            "error": str(e)
+                        })
+                delay = next_delay(delay)
+                continue
+
+            if jobs is None:
+                # Batch lookup unsupported; hand every pending job to its own poller,
+                # including any registered while this request was in flight
+                self.supported = False
+                self._fall_back()
+                return
+
+            now = loop.time()
+            for job_id in job_ids:
+                image_path, deadline, future = self._waiters[job_id]
+                job = jobs.get(job_id) or {}
+                status = job.get("status")
+                image_name = os.path.basename(image_path)
+
+                if status == "succeeded":
+                    print(f"  Completed: {image_name}")
+                    record = {
+                        "job_id": job_id,
+                        "image_path": image_path,
+                        "status": "completed",
+                        "result": job.get("manifest") or job.get("result")
+                    }
+                elif status == "failed":
+                    error = job.get("error", "Unknown error")
+                    print(f"  Failed: {image_name} - {error}")
+                    record = {
+                        "job_id": job_id,
+                        "image_path": image_path,
+                        "status": "failed",
+                        "error": error
+                    }
+                elif now >= deadline:
+                    print(f"  Timeout: {image_name}")
+                    record = {
+                        "job_id": job_id,
+                        "image_path": image_path,
+                        "status": "timeout"
+                    }
+                else:
+                    continue
+
+                del self._waiters[job_id]
+                future.set_result(record)
+
+            delay = next_delay(delay)
+
+    def _fall_back(self):
+        """Move every pending waiter to its own poll_job_async task"""
+        loop = asyncio.get_running_loop()
+        while self._waiters:
+            job_id, (image_path, deadline, future) = self._waiters.popitem()
+            # Only the time left before the job's deadline, not a fresh timeout
+            remaining = max(deadline - loop.time(), 0.0)
+            task = asyncio.create_task(self._poll_single(job_id, image_path, remaining, future))
+            self._single_tasks.add(task)
+            task.add_done_callback(self._single_tasks.discard)
+
+    async def _poll_single(self, job_id: str, image_path: str, timeout: float, future: asyncio.Future):
+        future.set_result(
+            await poll_job_async(self.session, job_id, image_path, timeout)
+        )
+
+
 async def process_batch(
     image_paths: List[str],
-    pattern_id: str
+    pattern_id: str,
+    session: Optional[aiohttp.ClientSession] = None
 ) -> List[Dict[str, Any]]:
     """
     Process multiple images concurrently.
@@ -163,46 +542,105 @@ async def process_batch(
     Args:
         image_paths: List of paths to image files
         pattern_id: Pattern ID to use
+        session: Shared session from create_session() (one is created if omitted)
 
     Returns:
-        list: Results for each image
+        list: Results for each image, in the same order as image_paths
     """
-    if not IMGGO_API_KEY:
-        raise ValueError("IMGGO_API_KEY environment variable not set")
+    if session is None:
+        async with create_session() as session:
+            return await process_batch(image_paths, pattern_id, session)
+
+    # Phase 0: Reuse stored results for images already processed with this pattern.
+    # Hashing and the cache lookup both touch disk, so each image does both in a
+    # single worker-thread hop off the event loop.
+    def digest_and_lookup(image_path: str):
+        digest = file_digest(image_path)
+        return digest, load_result(digest, pattern_id)
+
+    lookups = await asyncio.gather(
+        *(asyncio.to_thread(digest_and_lookup, image_path) for image_path in image_paths)
+    )
+
+    # Results stay in input order; a path listed twice is uploaded once and
+    # its result filled in at every index it appears
+    results: List[Optional[Dict[str, Any]]] = [None] * len(image_paths)
+    pending: Dict[str, List[int]] = {}
+    digests = {}
+    for index, (image_path, (digest, cached)) in enumerate(zip(image_paths, lookups)):
+        if cached is not None:
+            print(f"Cached: {os.path.basename(image_path)} (set IMGGO_NO_CACHE=1 to refresh)")
+            results[index] = {
+                "job_id": None,
+                "image_path": image_path,
+                "status": "completed",
+                "result": cached
+            }
+        else:
+            digests[image_path] = digest
+            pending.setdefault(image_path, []).append(index)
 
-    # Create session with auth header
-    headers = {
-        "Authorization": f"Bearer {IMGGO_API_KEY}"
-    }
+    if not pending:
+        return results
 
-    async with aiohttp.ClientSession(headers=headers) as session:
-        # Phase 1: Upload all images concurrently
-        print(f"\nUploading {len(image_paths)} images...")
-        upload_tasks = [
-            upload_image_async(session, image_path, pattern_id)
-            for image_path in image_paths
-        ]
-        upload_results = await asyncio.gather(*upload_tasks)
+    # Resolve names, MIME types and sizes once, before any upload starts
+    images = [prepare_image(image_path) for image_path in pending]
 
-        # Filter out failed uploads
-        successful_uploads = [
-            r for r in upload_results
-            if r["status"] == "uploaded" and r["job_id"]
-        ]
+    wait_for_job = stream_job_async if USE_JOB_EVENTS else poll_job_async
+    poller = BatchPoller(session) if USE_BATCH_POLL and not USE_JOB_EVENTS else None
 
-        if not successful_uploads:
-            print("\nNo successful uploads!")
-            return upload_results
+    async def wait_if_uploaded(upload: Dict[str, Any]) -> Dict[str, Any]:
+        if upload["status"] != "uploaded" or not upload["job_id"]:
+            return upload
+        if poller is not None:
+            return await poller.wait(upload["job_id"], upload["image_path"])
+        return await wait_for_job(session, upload["job_id"], upload["image_path"])
 
-        # Phase 2: Poll all jobs concurrently
-        print(f"\nProcessing {len(successful_uploads)} jobs...")
-        poll_tasks = [
-            poll_job_async(session, r["job_id"], r["image_path"])
-            for r in successful_uploads
-        ]
-        final_results = await asyncio.gather(*poll_tasks)
+    print(f"\nProcessing {len(images)} images...")
+    uploads = None
+    if USE_BATCH_INGEST:
+        uploads = await ingest_batch_async(session, images, pattern_id)
+
+    if uploads is not None:
+        # One request created every job; wait on them all concurrently
+        final_results = await asyncio.gather(*(wait_if_uploaded(u) for u in uploads))
+    else:
+        # Cap in-flight uploads so open files and sockets stay bounded for large batches
+        upload_limit = asyncio.Semaphore(MAX_CONCURRENCY)
+
+        async def upload_then_wait(image: PreparedImage) -> Dict[str, Any]:
+            # Each image starts polling as soon as its own upload finishes,
+            # instead of waiting for the slowest upload in the batch
+            async with upload_limit:
+                upload = await upload_image_async(session, image, pattern_id)
+            return await wait_if_uploaded(upload)
+
+        final_results = await asyncio.gather(*(upload_then_wait(image) for image in images))
+
+    for r in final_results:
+        if r["status"] == "completed":
+            store_result(digests[r["image_path"]], pattern_id, r["result"])
+        for index in pending[r["image_path"]]:
+            results[index] = r
+
+    return results
+
+
+def run(coro):
+    """Run a coroutine on uvloop when installed, else the default event loop"""
+    loop_factory = uvloop.new_event_loop if uvloop is not None else None
+
+    if sys.version_info >= (3, 11):
+        with asyncio.Runner(loop_factory=loop_factory) as runner:
+            # Python 3.12+: tasks run eagerly up to their first real await, so
+            # fan-out tasks that finish immediately skip the scheduler entirely
+            if hasattr(asyncio, "eager_task_factory"):
+                runner.get_loop().set_task_factory(asyncio.eager_task_factory)
+            return runner.run(coro)
 
-        return final_results
+    if uvloop is not None:
+        uvloop.install()
+    return asyncio.run(coro)
 
 
 def main():
@@ -226,7 +664,7 @@ def main():
 
     try:
         # Run async batch processing
-        results = asyncio.run(process_batch(image_paths, pattern_id))
+        results = run(process_batch(image_paths, pattern_id))
 
         # Display summary
         print("\n" + "="*60)
@@ -249,14 +687,19 @@ def main():
             print("\nIssues:")
             for r in failed + errors + timeouts:
                 error_msg = r.get("error", "Unknown")
-                print(f"  - {Path(r['image_path']).name}: {r['status']} - {error_msg}")
+                print(f"  - {os.path.basename(r['image_path'])}: {r['status']} - {error_msg}")
 
         print("\nResults saved to: batch_results.json")
 
-        # Save results to file
-        import json
-        with open("batch_results.json", "w") as f:
-            json.dump(results, f, indent=2)
+        # Save results to file one record at a time, so the whole document
+        # is never built as a single string in memory
+        with open("batch_results.json", "wb") as f:
+            f.write(b"[\n")
+            for i, r in enumerate(results):
+                if i:
+                    f.write(b",\n")
+                f.write(json_dumps(r))
+            f.write(b"\n]\n")
 
     except Exception as e:
         print(f"\nError: {e}")
@@ -11,12 +11,28 @@ Usage:
 import os
 import sys
 import time
+from pathlib import Path
 import requests
 
+# Shared JSON helpers (orjson when installed, else the stdlib) and polling schedule
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent / "common"))
+from json_utils import json_loads
+from polling import POLL_INITIAL_DELAY, poll_wait, next_delay
+
+# Stream multipart uploads from disk when requests-toolbelt is installed
+try:
+    from requests_toolbelt.multipart.encoder import MultipartEncoder
+except ImportError:
+    MultipartEncoder = None
+
+
 # Configuration
 IMGGO_API_KEY = os.getenv("IMGGO_API_KEY")
 IMGGO_BASE_URL = os.getenv("IMGGO_BASE_URL", "https://img-go.com/api")
 
+# Keep-alive session shared by the upload and every poll
+SESSION = requests.Session()
+
 
 def upload_image(image_path: str, pattern_id: str) -> dict:
     """
@@ -40,14 +56,23 @@ def upload_image(image_path: str, pattern_id: str) -> dict:
 
     import mimetypes
     mime_type, _ = mimetypes.guess_type(image_path)
+    filename = os.path.basename(image_path)
+    mime_type = mime_type or 'image/jpeg'
+    headers = {
+        "Authorization": f"Bearer {IMGGO_API_KEY}"
+    }
 
     with open(image_path, 'rb') as f:
-        response = requests.post(
+        if MultipartEncoder is not None:
+            # Send the file in chunks instead of building the whole body in memory
+            body = MultipartEncoder(fields={"image": (filename, f, mime_type)})
+            upload = {"data": body, "headers": {**headers, "Content-Type": body.content_type}}
+        else:
+            upload = {"files": {"image": (filename, f, mime_type)}, "headers": headers}
+
+        response = SESSION.post(
             f"{IMGGO_BASE_URL}/patterns/{pattern_id}/ingest",
-            headers={
-                "Authorization": f"Bearer {IMGGO_API_KEY}"
-            },
-            files={"image": (os.path.basename(image_path), f, mime_type or 'image/jpeg')}
+            **upload
         )
 
     response.raise_for_status()
@@ -64,14 +89,16 @@ def upload_image(image_path: str, pattern_id: str) -> dict:
     return result
 
 
-def poll_job(job_id: str, max_attempts: int = 60, interval: int = 2) -> dict:
+def poll_job(job_id: str, timeout: float = 120.0) -> dict:
     """
     Poll a job until it completes.
 
+    Checks quickly at first, then backs off exponentially (up to
+    POLL_MAX_DELAY seconds) unless the server sends Retry-After.
+
     Args:
         job_id: The job ID to poll
-        max_attempts: Maximum number of polling attempts
-        interval: Seconds between polling attempts
+        timeout: Maximum seconds to wait for the job
 
     Returns:
         dict: The extracted data
@@ -79,8 +106,13 @@ def poll_job(job_id: str, max_attempts: int = 60, interval: int = 2) -> dict:
     Raises:
         Exception: If job fails or times out
     """
-    for attempt in range(max_attempts):
-        response = requests.get(
+    deadline = time.monotonic() + timeout
+    delay = POLL_INITIAL_DELAY
+    attempt = 0
+
+    while time.monotonic() < deadline:
+        attempt += 1
+        response = SESSION.get(
             f"{IMGGO_BASE_URL}/jobs/{job_id}",
             headers={
                 "Authorization": f"Bearer {IMGGO_API_KEY}"
@@ -88,10 +120,10 @@ def poll_job(job_id: str, max_attempts: int = 60, interval: int = 2) -> dict:
         )
 
         response.raise_for_status()
-        data = response.json()["data"]
+        data = json_loads(response.content)["data"]
 
         status = data["status"]
-        print(f"  Attempt {attempt + 1}/{max_attempts}: {status}")
+        print(f"  Attempt {attempt}: {status}")
 
         if status == "succeeded":
             # Extract the result (manifest field contains the extracted data)
@@ -101,9 +133,10 @@ def poll_job(job_id: str, max_attempts: int = 60, interval: int = 2) -> dict:
             error = data.get("error", "Unknown error")
             raise Exception(f"Job failed: {error}")
 
-        time.sleep(interval)
+        time.sleep(poll_wait(response.headers, delay, deadline - time.monotonic()))
+        delay = next_delay(delay)
 
-    raise Exception(f"Job timeout after {max_attempts * interval} seconds")
+    raise Exception(f"Job timeout after {timeout:.0f} seconds")
 
 
 def main():
@@ -11,14 +11,31 @@ Usage:
 import os
 import sys
 import time
+import hashlib
+import mimetypes
+from pathlib import Path
 import requests
 from typing import Optional, Dict, Any
 
+# Shared JSON helpers (orjson when installed, else the stdlib) and polling schedule
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent / "common"))
+from json_utils import json_loads
+from polling import POLL_INITIAL_DELAY, poll_wait, next_delay
+
+# Stream multipart uploads from disk when requests-toolbelt is installed
+try:
+    from requests_toolbelt.multipart.encoder import MultipartEncoder
+except ImportError:
+    MultipartEncoder = None
+
 
 # Configuration
 IMGGO_API_KEY = os.getenv("IMGGO_API_KEY")
 IMGGO_BASE_URL = os.getenv("IMGGO_BASE_URL", "https://img-go.com/api")
 
+# Keep-alive session reused across retries and polls
+SESSION = requests.Session()
+
 
 class ImgGoError(Exception):
     """Base exception for ImgGo API errors"""
@@ -38,7 +55,8 @@ class JobFailedError(ImgGoError):
 def upload_with_retry(
     image_path: str,
     pattern_id: str,
-    max_retries: int = 3
+    max_retries: int = 3,
+    idempotency_key: Optional[str] = None
 ) -> dict:
     """
     Upload an image with automatic retry on failure.
@@ -47,6 +65,9 @@ def upload_with_retry(
         image_path: Path to the image file
         pattern_id: Pattern ID to use
         max_retries: Maximum number of retry attempts
+        idempotency_key: Key sent with every attempt so the server can dedupe
+            retries (defaults to a hash of image_path and pattern_id; pass a
+            fresh value to deliberately re-ingest the same file)
 
     Returns:
         dict: Extracted data
@@ -57,23 +78,39 @@ def upload_with_retry(
     if not IMGGO_API_KEY:
         raise ValueError("IMGGO_API_KEY environment variable not set")
 
+    # One short, stable key shared by all attempts
+    if idempotency_key is None:
+        idempotency_key = hashlib.blake2b(
+            f"{image_path}|{pattern_id}".encode(), digest_size=16
+        ).hexdigest()
+
+    # Resolve upload metadata once rather than on every retry
+    filename = os.path.basename(image_path)
+    mime_type, _ = mimetypes.guess_type(image_path)
+    mime_type = mime_type or 'image/jpeg'
+
     for attempt in range(max_retries):
         try:
             print(f"Upload attempt {attempt + 1}/{max_retries}")
 
             # Upload image
-            import mimetypes
-            mime_type, _ = mimetypes.guess_type(image_path)
+            headers = {
+                "Authorization": f"Bearer {IMGGO_API_KEY}",
+                "Idempotency-Key": idempotency_key
+            }
 
             with open(image_path, 'rb') as f:
-                response = requests.post(
+                if MultipartEncoder is not None:
+                    # Send the file in chunks instead of building the whole body in memory
+                    body = MultipartEncoder(fields={"image": (filename, f, mime_type)})
+                    upload = {"data": body, "headers": {**headers, "Content-Type": body.content_type}}
+                else:
+                    upload = {"files": {"image": (filename, f, mime_type)}, "headers": headers}
+
+                response = SESSION.post(
                     f"{IMGGO_BASE_URL}/patterns/{pattern_id}/ingest",
-                    headers={
-                        "Authorization": f"Bearer {IMGGO_API_KEY}",
-                        "Idempotency-Key": f"upload-{image_path}-{pattern_id}"
-                    },
-                    files={"image": (os.path.basename(image_path), f, mime_type or 'image/jpeg')},
-                    timeout=30
+                    timeout=30,
+                    **upload
                 )
 
             # Handle different HTTP status codes
@@ -124,13 +161,16 @@ def upload_with_retry(
     raise ImgGoError("Max retries exceeded")
 
 
-def poll_with_retry(job_id: str, max_attempts: int = 60) -> dict:
+def poll_with_retry(job_id: str, timeout: float = 120.0) -> dict:
     """
     Poll a job with error handling.
 
+    Checks quickly at first, then backs off exponentially (up to
+    POLL_MAX_DELAY seconds) unless the server sends Retry-After.
+
     Args:
         job_id: Job ID to poll
-        max_attempts: Maximum polling attempts
+        timeout: Maximum seconds to wait for the job
 
     Returns:
         dict: Extracted data
@@ -138,9 +178,14 @@ def poll_with_retry(job_id: str, max_attempts: int = 60) -> dict:
     Raises:
         JobFailedError: If job processing fails
     """
-    for attempt in range(max_attempts):
+    deadline = time.monotonic() + timeout
+    delay = POLL_INITIAL_DELAY
+    attempt = 0
+
+    while time.monotonic() < deadline:
+        attempt += 1
         try:
-            response = requests.get(
+            response = SESSION.get(
                 f"{IMGGO_BASE_URL}/jobs/{job_id}",
                 headers={
                     "Authorization": f"Bearer {IMGGO_API_KEY}"
@@ -151,14 +196,15 @@ def poll_with_retry(job_id: str, max_attempts: int = 60) -> dict:
             if response.status_code == 404:
                 # Job not found - might be temporary, retry
                 print(f"  Job not found yet, retrying...")
-                time.sleep(2)
+                time.sleep(poll_wait(response.headers, delay, deadline - time.monotonic()))
+                delay = next_delay(delay)
                 continue
 
             response.raise_for_status()
-            data = response.json()["data"]
+            data = json_loads(response.content)["data"]
 
             status = data["status"]
-            print(f"  Status: {status} ({attempt + 1}/{max_attempts})")
+            print(f"  Status: {status} (attempt {attempt})")
 
             if status == "succeeded":
                 result = data.get("manifest") or data.get("result")
@@ -174,7 +220,8 @@ def poll_with_retry(job_id: str, max_attempts: int = 60) -> dict:
                 raise JobFailedError(f"Job failed: {error}")
 
             # Still processing, wait
-            time.sleep(2)
+            time.sleep(poll_wait(response.headers, delay, deadline - time.monotonic()))
+            delay = next_delay(delay)
 
         except requests.exceptions.Timeout:
             print(f"  Poll timeout, retrying...")
@@ -184,7 +231,7 @@ def poll_with_retry(job_id: str, max_attempts: int = 60) -> dict:
             print(f"  Connection error, retrying...")
             time.sleep(2)
 
-    raise ImgGoError(f"Job timeout after {max_attempts} attempts")
+    raise ImgGoError(f"Job timeout after {timeout:.0f} seconds")
 
 
 def validate_result(result: Any) -> bool:
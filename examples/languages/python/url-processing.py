@@ -11,12 +11,21 @@ Usage:
 import os
 import sys
 import time
+from pathlib import Path
 import requests
 
+# Shared JSON helpers (orjson when installed, else the stdlib) and polling schedule
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent / "common"))
+from json_utils import json_loads
+from polling import POLL_INITIAL_DELAY, poll_wait, next_delay
+
 # Configuration
 IMGGO_API_KEY = os.getenv("IMGGO_API_KEY")
 IMGGO_BASE_URL = os.getenv("IMGGO_BASE_URL", "https://img-go.com/api")
 
+# Keep-alive session shared by the submit and every poll
+SESSION = requests.Session()
+
 
 def process_image_url(image_url: str, pattern_id: str) -> dict:
     """
@@ -35,7 +44,7 @@ def process_image_url(image_url: str, pattern_id: str) -> dict:
     print(f"Processing URL: {image_url}")
 
     # Step 1: Submit URL for processing
-    response = requests.post(
+    response = SESSION.post(
         f"{IMGGO_BASE_URL}/patterns/{pattern_id}/ingest",
         headers={
             "Authorization": f"Bearer {IMGGO_API_KEY}",
@@ -60,10 +69,15 @@ def process_image_url(image_url: str, pattern_id: str) -> dict:
     return result
 
 
-def poll_job(job_id: str, max_attempts: int = 60, interval: int = 2) -> dict:
-    """Poll a job until it completes"""
-    for attempt in range(max_attempts):
-        response = requests.get(
+def poll_job(job_id: str, timeout: float = 120.0) -> dict:
+    """Poll a job until it completes, backing off between checks"""
+    deadline = time.monotonic() + timeout
+    delay = POLL_INITIAL_DELAY
+    attempt = 0
+
+    while time.monotonic() < deadline:
+        attempt += 1
+        response = SESSION.get(
             f"{IMGGO_BASE_URL}/jobs/{job_id}",
             headers={
                 "Authorization": f"Bearer {IMGGO_API_KEY}"
@@ -71,10 +85,10 @@ def poll_job(job_id: str, max_attempts: int = 60, interval: int = 2) -> dict:
         )
 
         response.raise_for_status()
-        data = response.json()["data"]
+        data = json_loads(response.content)["data"]
 
         status = data["status"]
-        print(f"  Attempt {attempt + 1}/{max_attempts}: {status}")
+        print(f"  Attempt {attempt}: {status}")
 
         if status == "succeeded":
             return data.get("manifest") or data.get("result")
@@ -83,9 +97,10 @@ def poll_job(job_id: str, max_attempts: int = 60, interval: int = 2) -> dict:
             error = data.get("error", "Unknown error")
             raise Exception(f"Job failed: {error}")
 
-        time.sleep(interval)
+        time.sleep(poll_wait(response.headers, delay, deadline - time.monotonic()))
+        delay = next_delay(delay)
 
-    raise Exception(f"Job timeout after {max_attempts * interval} seconds")
+    raise Exception(f"Job timeout after {timeout:.0f} seconds")
 
 
 def main():
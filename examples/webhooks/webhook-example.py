@@ -8,20 +8,48 @@ Based on ImgGo API documentation:
 """
 
 import os
+import sys
 import json
 import hmac
 import hashlib
+from pathlib import Path
 import requests
-from flask import Flask, request, jsonify
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from flask import Flask, request
+
+# Shared JSON helpers (orjson when installed, else the stdlib)
+sys.path.append(str(Path(__file__).resolve().parent.parent / "common"))
+from json_utils import json_loads, json_dumps
 
 # Configuration
 IMGGO_API_KEY = os.getenv("IMGGO_API_KEY", "your_api_key_here")
 IMGGO_BASE_URL = "https://img-go.com/api"
 WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET", "your_webhook_secret_here")
 
+# Shared keep-alive session for API calls; retries transient gateway errors
+_SESSION = requests.Session()
+_SESSION.headers["Authorization"] = f"Bearer {IMGGO_API_KEY}"
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(total=3, backoff_factor=0.25, status_forcelist=[502, 503, 504], raise_on_status=False)
+))
+
+# Keyed HMAC state, built once; each verification copies it instead of
+# re-deriving the inner/outer key blocks from the secret
+_WEBHOOK_HMAC = hmac.new(WEBHOOK_SECRET.encode(), digestmod=hashlib.sha256)
+_SIGNATURE_PREFIX = "sha256="
+_SIGNATURE_LENGTH = len(_SIGNATURE_PREFIX) + 2 * hashlib.sha256().digest_size
+
 app = Flask(__name__)
 
 
+def _json_response(obj: dict, status: int = 200):
+    """Build a JSON response, serialized with orjson when it is installed"""
+    return app.response_class(json_dumps(obj), status=status, mimetype="application/json")
+
+
 def create_webhook(url: str, events: list[str]) -> dict:
     """
     Register a new webhook with ImgGo API
@@ -39,12 +67,8 @@ def create_webhook(url: str, events: list[str]) -> dict:
         "secret": WEBHOOK_SECRET  # Used to verify webhook signatures
     }
 
-    response = requests.post(
+    response = _SESSION.post(
         f"{IMGGO_BASE_URL}/webhooks",
-        headers={
-            "Authorization": f"Bearer {IMGGO_API_KEY}",
-            "Content-Type": "application/json"
-        },
         json=payload
     )
 
@@ -63,32 +87,29 @@ def verify_webhook_signature(payload: bytes, signature: str) -> bool:
     Returns:
         bool: True if signature is valid
     """
-    expected = hmac.new(
-        WEBHOOK_SECRET.encode(),
-        payload,
-        hashlib.sha256
-    ).hexdigest()
+    if not signature.startswith(_SIGNATURE_PREFIX):
+        return False
 
-    return hmac.compare_digest(f"sha256={expected}", signature)
+    # Compare the raw 32-byte digests rather than their hex encodings
+    try:
+        provided = bytes.fromhex(signature[len(_SIGNATURE_PREFIX):])
+    except ValueError:
+        return False
 
+    mac = _WEBHOOK_HMAC.copy()
+    mac.update(payload)
 
-@app.route("/webhook", methods=["POST"])
-def handle_webhook():
+    return hmac.compare_digest(mac.digest(), provided)
+
+
+def _dispatch(event: dict):
     """
-    Handle incoming webhook events from ImgGo
+    Handle a single webhook event
 
     Events:
     - job.succeeded: Job completed successfully
     - job.failed: Job failed
     """
-    # Verify signature
-    signature = request.headers.get("X-ImgGo-Signature", "")
-    if WEBHOOK_SECRET != "your_webhook_secret_here":
-        if not verify_webhook_signature(request.data, signature):
-            return jsonify({"error": "Invalid signature"}), 401
-
-    # Parse event
-    event = request.json
     event_type = event.get("event")
     job_id = event.get("data", {}).get("job_id")
 
@@ -109,7 +130,43 @@ def handle_webhook():
 
         # TODO: Handle failure (retry, notify admin, etc.)
 
-    return jsonify({"status": "received"}), 200
+
+@app.route("/webhook", methods=["POST"])
+def handle_webhook():
+    """
+    Handle incoming webhook events from ImgGo
+
+    ImgGo documents one event object per delivery.
+    """
+    verify = WEBHOOK_SECRET != "your_webhook_secret_here"
+    signature = request.headers.get("X-ImgGo-Signature", "")
+
+    # Reject malformed signature headers before reading the body or computing
+    # an HMAC; the header format is public, so this leaks nothing secret
+    if verify and (len(signature) != _SIGNATURE_LENGTH or not signature.startswith(_SIGNATURE_PREFIX)):
+        return _json_response({"error": "Invalid signature"}, 401)
+
+    # Read the raw body once; it is both the signed payload and the JSON to parse
+    payload = request.get_data(cache=False)
+
+    # Verify signature
+    if verify and not verify_webhook_signature(payload, signature):
+        return _json_response({"error": "Invalid signature"}, 401)
+
+    # Parse event(s); json and orjson decode errors both subclass ValueError
+    try:
+        body = json_loads(payload)
+    except ValueError:
+        return _json_response({"error": "Invalid JSON"}, 400)
+
+    # Speculative: batched (array) deliveries are not a documented ImgGo
+    # feature; an array body is tolerated and each element dispatched
+    events = body if isinstance(body, list) else [body]
+
+    for event in events:
+        _dispatch(event)
+
+    return _json_response({"status": "received"})
 
 
 def main():
@@ -134,6 +191,15 @@ def main():
         # print(f"Webhook registered: {result}")
         pass
 
+    if not os.getenv("DEV"):
+        # Production: a multi-threaded WSGI server. Handlers mostly wait on I/O
+        # (database writes, downstream calls), so size --threads to roughly the
+        # number of concurrent deliveries you expect per worker process
+        print("\nRun the webhook server with gunicorn:")
+        print("  gunicorn -k gthread -w 2 --threads 8 -b 0.0.0.0:5000 'webhook-example:app'")
+        print("\nOr set DEV=1 to use Flask's development server (with debugger)")
+        return
+
     print("\nStarting webhook server on http://localhost:5000")
     print("Webhook endpoint: http://localhost:5000/webhook")
     print("\nTo test locally, use ngrok or similar to expose this server")
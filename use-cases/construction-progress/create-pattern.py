@@ -4,10 +4,21 @@ Create ImgGo Pattern for Construction Progress
 
 import os
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 API_KEY = os.getenv("IMGGO_API_KEY")
 BASE_URL = "https://img-go.com/api"
 
+# Shared keep-alive session; retries transient gateway errors
+_SESSION = requests.Session()
+_SESSION.headers["Authorization"] = f"Bearer {API_KEY}"
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(total=3, backoff_factor=0.25, status_forcelist=[502, 503, 504], raise_on_status=False)
+))
+
 def create_pattern():
     if not API_KEY:
         print("X Error: IMGGO_API_KEY not set")
@@ -28,9 +39,8 @@ def create_pattern():
     print()
 
     try:
-        response = requests.post(
+        response = _SESSION.post(
             f"{BASE_URL}/patterns",
-            headers={"Authorization": f"Bearer {API_KEY}", "Content-Type": "application/json"},
             json=payload
         )
 
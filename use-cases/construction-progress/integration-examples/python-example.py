@@ -5,12 +5,29 @@ Extract progress data from construction site photos in YAML format
 
 import os
 import sys
+import asyncio
 import yaml
 from pathlib import Path
 
-sys.path.append(str(Path(__file__).parent.parent.parent.parent / "examples" / "common"))
+REPO_ROOT = Path(__file__).resolve().parents[3]
+COMMON_DIR = str(REPO_ROOT / "examples" / "common")
+if COMMON_DIR not in sys.path:
+    sys.path.append(COMMON_DIR)
 
-from imggo_client import ImgGoClient
+from imggo_client import ImgGoClient, AsyncImgGoClient
+
+# Prefer the libyaml C loader/dumper, falling back to pure Python. Binary
+# wheels usually include libyaml; if not, build it from source with
+# `pip install pyyaml --no-binary pyyaml` after installing libyaml-dev
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YamlDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+
+def parse_progress(result) -> dict:
+    """Parse a construction progress result (YAML text) into a dict"""
+    if isinstance(result, dict):
+        return result
+    return yaml.load(result, Loader=_YamlLoader)
 
 
 def track_construction_progress(image_url: str) -> dict:
@@ -26,27 +43,44 @@ def track_construction_progress(image_url: str) -> dict:
         pattern_id=PATTERN_ID
     )
 
-    # Parse YAML result
-    progress_data = yaml.safe_load(result)
+    return parse_progress(result)
 
-    return progress_data
 
+async def track_construction_progress_async(image_url: str, client: AsyncImgGoClient) -> dict:
+    """Extract construction progress from a site photo using a shared async client"""
+    PATTERN_ID = os.getenv("CONSTRUCTION_PATTERN_ID", "pat_construction_yaml")
 
-def calculate_overall_completion(progress: dict) -> float:
-    """Calculate overall project completion percentage"""
-    if 'zones' not in progress or not progress['zones']:
-        return 0.0
+    print(f"\nProcessing construction image: {image_url}")
 
-    total_completion = sum(zone.get('overall_completion', 0) for zone in progress['zones'])
-    return total_completion / len(progress['zones'])
+    result = await client.process_image_url(
+        image_url=image_url,
+        pattern_id=PATTERN_ID
+    )
 
+    # Parsed inside the task, so it overlaps with the other cameras' network waits
+    return parse_progress(result)
 
-def identify_behind_schedule_zones(progress: dict, threshold: float = 70.0) -> list:
-    """Identify zones that are behind schedule"""
+
+async def track_many_async(image_urls: list) -> list:
+    """Track several site cameras concurrently over one pooled HTTP/2 client"""
+    async with AsyncImgGoClient() as client:
+        return await asyncio.gather(
+            *(track_construction_progress_async(url, client) for url in image_urls),
+            return_exceptions=True
+        )
+
+
+def summarize_zones(progress: dict, threshold: float = 70.0) -> tuple:
+    """Overall completion, per-zone rows and behind-schedule zones in one pass"""
+    zones = progress.get('zones') or ()
+    total_completion = 0
+    rows = []
     behind_schedule = []
 
-    for zone in progress.get('zones', []):
+    for zone in zones:
         completion = zone.get('overall_completion', 0)
+        total_completion += completion
+        rows.append((zone.get('zone_id', 'Unknown'), completion))
         if completion < threshold:
             behind_schedule.append({
                 'zone_id': zone.get('zone_id'),
@@ -54,30 +88,40 @@ def identify_behind_schedule_zones(progress: dict, threshold: float = 70.0) -> l
                 'gap': threshold - completion
             })
 
-    return behind_schedule
+    overall = total_completion / len(zones) if zones else 0.0
+    return overall, rows, behind_schedule
+
+
+def calculate_overall_completion(progress: dict) -> float:
+    """Calculate overall project completion percentage"""
+    return summarize_zones(progress)[0]
+
+
+def identify_behind_schedule_zones(progress: dict, threshold: float = 70.0) -> list:
+    """Identify zones that are behind schedule"""
+    return summarize_zones(progress, threshold)[2]
 
 
 def generate_progress_report(progress: dict) -> str:
     """Generate human-readable progress report"""
+    overall, rows, behind = summarize_zones(progress)
+
     report = []
     report.append(f"Project: {progress.get('project_id', 'Unknown')}")
     report.append(f"Date: {progress.get('inspection_date', 'Unknown')}")
     report.append("-" * 60)
 
-    overall = calculate_overall_completion(progress)
     report.append(f"\nOverall Completion: {overall:.1f}%")
 
     report.append(f"\nZone Progress:")
-    for zone in progress.get('zones', []):
-        zone_id = zone.get('zone_id', 'Unknown')
-        completion = zone.get('overall_completion', 0)
-        report.append(f"  {zone_id}: {completion}%")
+    report.extend(f"  {zone_id}: {completion}%" for zone_id, completion in rows)
 
-    behind = identify_behind_schedule_zones(progress)
     if behind:
         report.append(f"\nZones Behind Schedule:")
-        for zone in behind:
-            report.append(f"  {zone['zone_id']}: {zone['completion']}% ({zone['gap']:.1f}% gap)")
+        report.extend(
+            f"  {zone['zone_id']}: {zone['completion']}% ({zone['gap']:.1f}% gap)"
+            for zone in behind
+        )
 
     return "\n".join(report)
 
@@ -91,25 +135,48 @@ def main():
         print("\n✗ Error: IMGGO_API_KEY not set")
         sys.exit(1)
 
-    # Example construction site image URL
-    image_url = "https://construction-camera.example.com/site-123/latest.jpg"
+    # Example construction site image URL (pass one or more URLs to override)
+    image_urls = sys.argv[1:] or ["https://construction-camera.example.com/site-123/latest.jpg"]
 
     try:
-        # Track progress
-        progress = track_construction_progress(image_url)
-
-        # Display progress
-        print("\n" + "="*60)
-        print("CONSTRUCTION PROGRESS")
-        print("="*60)
-        report = generate_progress_report(progress)
-        print(report)
-
-        # Save YAML
-        output_file = "construction_progress.yaml"
-        with open(output_file, 'w') as f:
-            yaml.dump(progress, f, default_flow_style=False, sort_keys=False)
-        print(f"\n✓ Saved to {output_file}")
+        # Track progress for every camera concurrently
+        try:
+            results = asyncio.run(track_many_async(image_urls))
+        except ImportError:
+            # httpx not installed; process the cameras one at a time
+            results = []
+            for url in image_urls:
+                try:
+                    results.append(track_construction_progress(url))
+                except Exception as e:
+                    results.append(e)
+
+        failed = False
+        for index, (image_url, progress) in enumerate(zip(image_urls, results), 1):
+            if isinstance(progress, BaseException):
+                print(f"\n✗ Error processing {image_url}: {progress}")
+                failed = True
+                continue
+
+            # Display progress
+            print("\n" + "="*60)
+            print("CONSTRUCTION PROGRESS")
+            print("="*60)
+            report = generate_progress_report(progress)
+            print(report)
+
+            # Save YAML
+            if len(image_urls) == 1:
+                output_file = "construction_progress.yaml"
+            else:
+                output_file = f"construction_progress_{index}.yaml"
+            with open(output_file, 'wb') as f:
+                f.write(yaml.dump(progress, Dumper=_YamlDumper, default_flow_style=False,
+                                  sort_keys=False, encoding='utf-8'))
+            print(f"\n✓ Saved to {output_file}")
+
+        if failed:
+            sys.exit(1)
 
         print("\n✓ Construction progress tracking completed!")
 
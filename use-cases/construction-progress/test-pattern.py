@@ -6,7 +6,14 @@ import os
 import sys
 from pathlib import Path
 
-sys.path.append(str(Path(__file__).parent.parent.parent / "examples" / "common"))
+# Paths resolved once at import
+HERE = Path(__file__).resolve().parent
+REPO_ROOT = HERE.parents[1]
+COMMON_DIR = str(REPO_ROOT / "examples" / "common")
+TEST_IMAGE = REPO_ROOT / "examples" / "test-images" / "construction1.jpg"
+
+if COMMON_DIR not in sys.path:
+    sys.path.append(COMMON_DIR)
 from imggo_client import ImgGoClient
 
 def main():
@@ -20,14 +27,14 @@ def main():
 
     pattern_id = os.getenv("CONSTRUCTION_PATTERN_ID")
     if not pattern_id:
-        pattern_file = Path(__file__).parent / "pattern_id.txt"
+        pattern_file = HERE / "pattern_id.txt"
         if pattern_file.exists():
             pattern_id = pattern_file.read_text().strip()
     if not pattern_id:
         print("\nX Error: CONSTRUCTION_PATTERN_ID not set")
         sys.exit(1)
 
-    test_image = Path(__file__).parent.parent.parent / "examples" / "test-images" / "construction1.jpg"
+    test_image = TEST_IMAGE
     if not test_image.exists():
         print(f"\nX Error: Test image not found: {test_image}")
         sys.exit(1)
@@ -46,7 +53,7 @@ def main():
 
         print("V Processing completed!\n")
 
-        outputs_dir = Path(__file__).parent / "outputs"
+        outputs_dir = HERE / "outputs"
         outputs_dir.mkdir(exist_ok=True)
 
         output_file = outputs_dir / "construction_output.yaml"
@@ -55,8 +62,8 @@ def main():
             content = result.get('_raw', str(result))
         else:
             content = result
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(content)
+        with open(output_file, 'wb') as f:
+            f.write(content.encode('utf-8'))
 
         print(f"V Output saved to: {output_file}\n")
         print("="*60)
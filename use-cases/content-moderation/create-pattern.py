@@ -4,11 +4,33 @@ Detect inappropriate content in images
 """
 
 import os
+import sys
+from pathlib import Path
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+sys.path.append(str(Path(__file__).parent.parent.parent / "examples" / "common"))
+from json_utils import json_dumps
 
 API_KEY = os.getenv("IMGGO_API_KEY")
 BASE_URL = "https://img-go.com/api"
 
+# Shared keep-alive session; retries transient gateway errors
+_SESSION = requests.Session()
+_SESSION.headers["Authorization"] = f"Bearer {API_KEY}"
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(total=3, backoff_factor=0.25, status_forcelist=[502, 503, 504], raise_on_status=False)
+))
+
+
+def _post_json(url: str, payload: dict) -> requests.Response:
+    """POST a JSON body, encoded with orjson when it is installed"""
+    return _SESSION.post(url, data=json_dumps(payload), headers={"Content-Type": "application/json"})
+
+
 def create_moderation_pattern():
     if not API_KEY:
         print("X Error: IMGGO_API_KEY not set")
@@ -39,11 +61,7 @@ def create_moderation_pattern():
     print()
 
     try:
-        response = requests.post(
-            f"{BASE_URL}/patterns",
-            headers={"Authorization": f"Bearer {API_KEY}", "Content-Type": "application/json"},
-            json=payload
-        )
+        response = _post_json(f"{BASE_URL}/patterns", payload)
 
         print(f"Response Status: {response.status_code}")
         if response.status_code != 201:
@@ -1,17 +1,41 @@
 """
 Content Moderation - Python Integration Example
 Detect inappropriate content in images using AI-powered analysis
+
+Optional: pip install "httpx[http2]" orjson "celery[redis]"
+With celery installed and CELERY_BROKER_URL set, deferred work runs on workers:
+    CELERY_BROKER_URL=redis://localhost:6379/0 celery -A python-example:celery_app worker
 """
 
 import os
 import sys
-import json
+import asyncio
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from celery import Celery
+except ImportError:
+    Celery = None
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+COMMON_DIR = str(REPO_ROOT / "examples" / "common")
+# Same sample image test-pattern.py moderates (the repo has no dedicated moderation image)
+DEFAULT_IMAGE = REPO_ROOT / "examples" / "test-images" / "resume1.png"
+if COMMON_DIR not in sys.path:
+    sys.path.append(COMMON_DIR)
 
-sys.path.append(str(Path(__file__).parent.parent.parent.parent / "examples" / "common"))
+from imggo_client import ImgGoClient, AsyncImgGoClient
+from json_utils import json_loads, json_dumps_indented
+from response_cache import cached_process_image, cached_process_image_async
 
-from imggo_client import ImgGoClient
+# Deferred moderation work goes to Celery when a broker is configured
+# (e.g. CELERY_BROKER_URL=redis://localhost:6379/0), else to a local background thread
+CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL")
+celery_app = Celery("content_moderation", broker=CELERY_BROKER_URL) if Celery is not None and CELERY_BROKER_URL else None
+_BACKGROUND = ThreadPoolExecutor(max_workers=1, thread_name_prefix="moderation")
 
 
 def process_content_image(image_path: str) -> dict:
@@ -22,65 +46,79 @@ def process_content_image(image_path: str) -> dict:
 
     print(f"\nProcessing image for moderation: {Path(image_path).name}")
 
-    result = client.process_image(
-        image_path=image_path,
-        pattern_id=PATTERN_ID
-    )
+    # Identical image bytes reuse the stored result instead of calling the API
+    result = cached_process_image(client, image_path, PATTERN_ID)
+
+    return json_loads(result) if isinstance(result, (str, bytes)) else result
+
+
+async def process_content_image_async(image_path: str, client: AsyncImgGoClient) -> dict:
+    """Process image for content moderation using a shared async client"""
+    PATTERN_ID = os.getenv("CONTENT_MODERATION_PATTERN_ID", "pat_content_moderation_json")
+
+    print(f"\nProcessing image for moderation: {Path(image_path).name}")
+
+    result = await cached_process_image_async(client, image_path, PATTERN_ID)
 
-    return json.loads(result) if isinstance(result, str) else result
+    # Parsed inside the task, so it overlaps with the other uploads' network waits
+    return json_loads(result) if isinstance(result, (str, bytes)) else result
+
+
+async def process_many_async(image_paths: List[str]) -> list:
+    """Moderate several images concurrently over one pooled HTTP/2 client"""
+    async with AsyncImgGoClient() as client:
+        return await asyncio.gather(
+            *(process_content_image_async(path, client) for path in image_paths),
+            return_exceptions=True
+        )
+
+
+# (result key, flagged label, weight, scale by confidence, reason template or None)
+RISK_CATEGORIES = (
+    ('explicit_content', 'Explicit Content', 100, True, "Explicit content detected ({:.0%} confidence)"),
+    ('violence', 'Violence', 80, True, "Violent content detected ({:.0%} confidence)"),
+    ('hate_symbols', 'Hate Symbols', 100, False, "Hate symbols detected"),
+    ('profanity', 'Profanity', 30, False, None),
+)
+
+# Score thresholds and the (risk level, action) for each band between them
+RISK_THRESHOLDS = (20, 50, 80)
+RISK_BANDS = (('SAFE', 'APPROVE'), ('LOW', 'FLAG'), ('MEDIUM', 'REVIEW'), ('HIGH', 'BLOCK'))
 
 
 def calculate_risk_score(moderation_result: dict) -> dict:
     """Calculate overall risk score and categorize content"""
-    risk_analysis = {
-        'overall_risk': 0,
-        'risk_level': 'SAFE',
-        'flagged_categories': [],
-        'action_required': 'APPROVE',
-        'reasons': []
+    flagged = []
+    reasons = []
+    score = 0
+    get = moderation_result.get
+
+    for key, label, weight, scaled, reason in RISK_CATEGORIES:
+        entry = get(key)
+        if not entry or not entry.get('detected', False):
+            continue
+
+        if scaled:
+            confidence = entry.get('confidence', 0)
+            score += confidence * weight
+        else:
+            confidence = None
+            score += weight
+
+        flagged.append(label)
+        if reason is not None:
+            reasons.append(reason.format(confidence))
+
+    risk_level, action = RISK_BANDS[bisect_right(RISK_THRESHOLDS, score)]
+
+    return {
+        'overall_risk': score,
+        'risk_level': risk_level,
+        'flagged_categories': flagged,
+        'action_required': action,
+        'reasons': reasons
     }
 
-    # Check for explicit content
-    if moderation_result.get('explicit_content', {}).get('detected', False):
-        confidence = moderation_result['explicit_content'].get('confidence', 0)
-        risk_analysis['overall_risk'] += confidence * 100
-        risk_analysis['flagged_categories'].append('Explicit Content')
-        risk_analysis['reasons'].append(f"Explicit content detected ({confidence:.0%} confidence)")
-
-    # Check for violence
-    if moderation_result.get('violence', {}).get('detected', False):
-        confidence = moderation_result['violence'].get('confidence', 0)
-        risk_analysis['overall_risk'] += confidence * 80
-        risk_analysis['flagged_categories'].append('Violence')
-        risk_analysis['reasons'].append(f"Violent content detected ({confidence:.0%} confidence)")
-
-    # Check for hate symbols
-    if moderation_result.get('hate_symbols', {}).get('detected', False):
-        risk_analysis['overall_risk'] += 100
-        risk_analysis['flagged_categories'].append('Hate Symbols')
-        risk_analysis['reasons'].append("Hate symbols detected")
-
-    # Check for profanity in text
-    if moderation_result.get('profanity', {}).get('detected', False):
-        risk_analysis['overall_risk'] += 30
-        risk_analysis['flagged_categories'].append('Profanity')
-
-    # Determine risk level
-    if risk_analysis['overall_risk'] >= 80:
-        risk_analysis['risk_level'] = 'HIGH'
-        risk_analysis['action_required'] = 'BLOCK'
-    elif risk_analysis['overall_risk'] >= 50:
-        risk_analysis['risk_level'] = 'MEDIUM'
-        risk_analysis['action_required'] = 'REVIEW'
-    elif risk_analysis['overall_risk'] >= 20:
-        risk_analysis['risk_level'] = 'LOW'
-        risk_analysis['action_required'] = 'FLAG'
-    else:
-        risk_analysis['risk_level'] = 'SAFE'
-        risk_analysis['action_required'] = 'APPROVE'
-
-    return risk_analysis
-
 
 def save_to_moderation_system(moderation_result: dict, risk_analysis: dict, content_id: str) -> bool:
     """Save moderation results to content management system"""
@@ -161,14 +199,12 @@ def generate_moderation_report(moderation_result: dict, risk_analysis: dict) ->
 
     if risk_analysis['flagged_categories']:
         lines.append("FLAGGED CATEGORIES:")
-        for category in risk_analysis['flagged_categories']:
-            lines.append(f"  ✗ {category}")
+        lines.extend(f"  ✗ {category}" for category in risk_analysis['flagged_categories'])
         lines.append("")
 
     if risk_analysis['reasons']:
         lines.append("REASONS:")
-        for reason in risk_analysis['reasons']:
-            lines.append(f"  • {reason}")
+        lines.extend(f"  • {reason}" for reason in risk_analysis['reasons'])
         lines.append("")
 
     lines.append("DETAILED ANALYSIS:")
@@ -181,6 +217,73 @@ def generate_moderation_report(moderation_result: dict, risk_analysis: dict) ->
     return "\n".join(lines)
 
 
+def fast_path(image_path: str, moderation_result: Optional[dict] = None) -> Tuple[dict, dict, str]:
+    """
+    Classify one image and decide the action; this is all a caller has to wait for
+
+    Pass moderation_result when the image was already processed (e.g. concurrently).
+    """
+    if moderation_result is None:
+        moderation_result = process_content_image(image_path)
+    risk_analysis = calculate_risk_score(moderation_result)
+    content_id = f"IMG-{Path(image_path).stem}"
+    return moderation_result, risk_analysis, content_id
+
+
+def print_risk_summary(risk_analysis: dict, content_id: str):
+    """Print the fast-path classification for one image"""
+    print("\n" + "="*60)
+    print(f"MODERATION ANALYSIS - {content_id}")
+    print("="*60)
+    print(f"Risk Level: {risk_analysis['risk_level']}")
+    print(f"Risk Score: {risk_analysis['overall_risk']:.1f}/100")
+    print(f"Recommended Action: {risk_analysis['action_required']}")
+
+    if risk_analysis['flagged_categories']:
+        print(f"\nFlagged Categories ({len(risk_analysis['flagged_categories'])}):")
+        for category in risk_analysis['flagged_categories']:
+            print(f"  ✗ {category}")
+
+
+def deferred_moderation(moderation_result: dict, risk_analysis: dict, content_id: str, suffix: str = "") -> str:
+    """Save, act on and write out a moderation result (runs off the request path)"""
+    # Save raw JSON
+    output_file = f"moderation_result{suffix}.json"
+    with open(output_file, 'wb') as f:
+        f.write(json_dumps_indented(moderation_result))
+    print(f"\n✓ Saved moderation result to {output_file}")
+
+    # Generate report
+    report = generate_moderation_report(moderation_result, risk_analysis)
+    print("\n" + report)
+
+    # Save to moderation system
+    save_to_moderation_system(moderation_result, risk_analysis, content_id)
+
+    # Trigger action
+    action_result = trigger_moderation_action(risk_analysis, content_id)
+
+    # Save report
+    report_file = f"moderation_report{suffix}.txt"
+    with open(report_file, 'wb') as f:
+        f.write(report.encode('utf-8'))
+    print(f"\n✓ Saved moderation report to {report_file}")
+
+    return action_result
+
+
+if celery_app is not None:
+    # Workers: celery -A python-example worker (run from this directory)
+    deferred_moderation_task = celery_app.task(name="content_moderation.deferred_moderation")(deferred_moderation)
+
+
+def enqueue_deferred_moderation(moderation_result: dict, risk_analysis: dict, content_id: str, suffix: str = ""):
+    """Queue deferred_moderation on Celery, or on the local background thread"""
+    if celery_app is not None:
+        return deferred_moderation_task.delay(moderation_result, risk_analysis, content_id, suffix)
+    return _BACKGROUND.submit(deferred_moderation, moderation_result, risk_analysis, content_id, suffix)
+
+
 def main():
     print("="*60)
     print("CONTENT MODERATION - PYTHON EXAMPLE")
@@ -190,53 +293,53 @@ def main():
         print("\n✗ Error: IMGGO_API_KEY not set")
         sys.exit(1)
 
-    test_image = Path(__file__).parent.parent.parent.parent / "test-images" / "content-moderation1.jpg"
+    # Images to moderate (pass one or more paths to override the sample)
+    image_paths = sys.argv[1:] or [str(DEFAULT_IMAGE)]
 
-    if not test_image.exists():
-        print(f"\n⚠ Test image not found: {test_image}")
-        sys.exit(1)
+    for image_path in image_paths:
+        if not Path(image_path).exists():
+            print(f"\n⚠ Test image not found: {image_path}")
+            sys.exit(1)
 
     try:
-        # Process image for moderation
-        moderation_result = process_content_image(str(test_image))
-
-        # Save raw JSON
-        output_file = "moderation_result.json"
-        with open(output_file, 'w') as f:
-            json.dump(moderation_result, f, indent=2)
-        print(f"\n✓ Saved moderation result to {output_file}")
-
-        # Calculate risk
-        risk_analysis = calculate_risk_score(moderation_result)
-
-        print("\n" + "="*60)
-        print("MODERATION ANALYSIS")
-        print("="*60)
-        print(f"Risk Level: {risk_analysis['risk_level']}")
-        print(f"Risk Score: {risk_analysis['overall_risk']:.1f}/100")
-        print(f"Recommended Action: {risk_analysis['action_required']}")
-
-        if risk_analysis['flagged_categories']:
-            print(f"\nFlagged Categories ({len(risk_analysis['flagged_categories'])}):")
-            for category in risk_analysis['flagged_categories']:
-                print(f"  ✗ {category}")
-
-        # Generate report
-        report = generate_moderation_report(moderation_result, risk_analysis)
-        print("\n" + report)
-
-        # Save to moderation system
-        content_id = f"IMG-{Path(test_image).stem}"
-        save_to_moderation_system(moderation_result, risk_analysis, content_id)
-
-        # Trigger action
-        action_result = trigger_moderation_action(risk_analysis, content_id)
-
-        # Save report
-        report_file = "moderation_report.txt"
-        with open(report_file, 'w') as f:
-            f.write(report)
-        print(f"\n✓ Saved moderation report to {report_file}")
+        # Process every image for moderation concurrently
+        try:
+            results = asyncio.run(process_many_async(image_paths))
+        except ImportError:
+            # httpx not installed; process the images one at a time
+            results = []
+            for image_path in image_paths:
+                try:
+                    results.append(process_content_image(image_path))
+                except Exception as e:
+                    results.append(e)
+
+        failed = False
+        pending = []
+        for image_path, moderation_result in zip(image_paths, results):
+            if isinstance(moderation_result, BaseException):
+                print(f"\n✗ Error processing {Path(image_path).name}: {moderation_result}")
+                failed = True
+                continue
+
+            # Keep the original file names for a single image
+            suffix = "" if len(image_paths) == 1 else f"_{Path(image_path).stem}"
+
+            # Fast path: classify and decide, then hand the rest to the worker
+            moderation_result, risk_analysis, content_id = fast_path(image_path, moderation_result)
+            print_risk_summary(risk_analysis, content_id)
+
+            pending.append(enqueue_deferred_moderation(moderation_result, risk_analysis, content_id, suffix))
+
+        # Wait for local background work so its output and files are complete before exit
+        if celery_app is None:
+            for future in pending:
+                future.result()
+        else:
+            print(f"\n✓ Queued {len(pending)} moderation task(s) on Celery")
+
+        if failed:
+            sys.exit(1)
 
         print("\n✓ Content moderation completed!")
 
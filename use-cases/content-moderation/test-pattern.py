@@ -8,8 +8,17 @@ import sys
 import json
 from pathlib import Path
 
-sys.path.append(str(Path(__file__).parent.parent.parent / "examples" / "common"))
+# Paths resolved once at import
+HERE = Path(__file__).resolve().parent
+REPO_ROOT = HERE.parents[1]
+COMMON_DIR = str(REPO_ROOT / "examples" / "common")
+TEST_IMAGE = REPO_ROOT / "examples" / "test-images" / "resume1.png"
+
+if COMMON_DIR not in sys.path:
+    sys.path.append(COMMON_DIR)
 from imggo_client import ImgGoClient
+from json_utils import json_loads, json_dumps_indented
+
 
 def main():
     print("="*60)
@@ -23,7 +32,7 @@ def main():
     # Check pattern ID - from env var or pattern_id.txt
     pattern_id = os.getenv("CONTENT_MODERATION_PATTERN_ID")
     if not pattern_id:
-        pattern_file = Path(__file__).parent / "pattern_id.txt"
+        pattern_file = HERE / "pattern_id.txt"
         if pattern_file.exists():
             pattern_id = pattern_file.read_text().strip()
     if not pattern_id:
@@ -32,7 +41,7 @@ def main():
         sys.exit(1)
 
     # Use resume image for content moderation
-    test_image = Path(__file__).parent.parent.parent / "examples" / "test-images" / "resume1.png"
+    test_image = TEST_IMAGE
     if not test_image.exists():
         print(f"\nX Error: Test image not found: {test_image}")
         sys.exit(1)
@@ -44,6 +53,7 @@ def main():
         client = ImgGoClient()
         print("Processing image for content moderation...")
 
+        # Always call the API so edits to the pattern show up immediately
         result = client.process_image(
             image_path=str(test_image),
             pattern_id=pattern_id
@@ -51,15 +61,16 @@ def main():
 
         print("V Processing completed!\n")
 
-        outputs_dir = Path(__file__).parent / "outputs"
+        outputs_dir = HERE / "outputs"
         outputs_dir.mkdir(exist_ok=True)
 
         # JSON format output
         output_file = outputs_dir / "moderation_output.json"
         try:
-            mod_data = result if isinstance(result, dict) else json.loads(result)
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(mod_data, f, indent=2)
+            mod_data = result if isinstance(result, dict) else json_loads(result)
+            pretty = json_dumps_indented(mod_data)
+            with open(output_file, 'wb') as f:
+                f.write(pretty)
 
             print(f"V Output saved to: {output_file}\n")
             print("="*60)
@@ -69,8 +80,8 @@ def main():
 
         except json.JSONDecodeError:
             # Not JSON, save as text
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(result if isinstance(result, str) else str(result))
+            with open(output_file, 'wb') as f:
+                f.write((result if isinstance(result, str) else str(result)).encode('utf-8'))
             print(f"V Output saved to: {output_file}\n")
             print("="*60)
             print("EXTRACTED DATA")
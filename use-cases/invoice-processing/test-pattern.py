@@ -4,10 +4,15 @@ Extracts structured data from invoice images
 """
 
 import os
+import sys
+import json
 import requests
 import time
 from pathlib import Path
 
+sys.path.append(str(Path(__file__).parent.parent.parent / "examples" / "common"))
+from json_utils import json_loads, json_dumps_indented
+
 # Configuration
 IMGGO_API_KEY = os.getenv("IMGGO_API_KEY", "your_api_key_here")
 IMGGO_BASE_URL = "https://img-go.com/api"
@@ -126,16 +131,16 @@ def main():
         print("="*50)
 
         # If result is JSON string, parse it
-        import json
         if isinstance(invoice_data, str):
-            invoice_data = json.loads(invoice_data)
+            invoice_data = json_loads(invoice_data)
 
+        # ASCII-escaped for the console; UTF-8 bytes for the file
         print(json.dumps(invoice_data, indent=2))
 
         # Save to file
         output_file = Path("invoice_output.json")
-        with open(output_file, 'w') as f:
-            json.dump(invoice_data, f, indent=2)
+        with open(output_file, 'wb') as f:
+            f.write(json_dumps_indented(invoice_data))
 
         print(f"\nV Results saved to {output_file}")
 
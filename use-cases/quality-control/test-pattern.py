@@ -10,6 +10,8 @@ from pathlib import Path
 
 sys.path.append(str(Path(__file__).parent.parent.parent / "examples" / "common"))
 from imggo_client import ImgGoClient
+from json_utils import json_loads, json_dumps_indented
+
 
 def main():
     print("="*60)
@@ -57,9 +59,10 @@ def main():
         # JSON format output
         output_file = outputs_dir / "quality_control_output.json"
         try:
-            qc_data = result if isinstance(result, dict) else json.loads(result)
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(qc_data, f, indent=2)
+            qc_data = result if isinstance(result, dict) else json_loads(result)
+            pretty = json_dumps_indented(qc_data)
+            with open(output_file, 'wb') as f:
+                f.write(pretty)
 
             print(f"V Output saved to: {output_file}\n")
             print("="*60)
@@ -12,6 +12,7 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent.parent / "examples" / "common"))
 
 from imggo_client import ImgGoClient
+from json_utils import json_loads, json_dumps_indented
 
 
 def main():
@@ -66,10 +67,11 @@ def main():
 
         # Try to parse as JSON
         try:
-            shelf_data = result if isinstance(result, dict) else json.loads(result)
+            shelf_data = result if isinstance(result, dict) else json_loads(result)
             output_file = outputs_dir / "shelf_audit_output.json"
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(shelf_data, f, indent=2)
+            pretty = json_dumps_indented(shelf_data)
+            with open(output_file, 'wb') as f:
+                f.write(pretty)
 
             print(f"V Output saved to: {output_file}")
             print()